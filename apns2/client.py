@@ -1,16 +1,31 @@
 import asyncio
-import collections
+import functools
 import json
 import logging
+import os
+import sys
+import threading
+import weakref
 from enum import Enum
-from typing import Any, Callable, Coroutine, Iterable, TYPE_CHECKING, TypeVar
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Coroutine,
+    Iterable,
+    NamedTuple,
+    TYPE_CHECKING,
+    TypeVar,
+)
+
+import orjson
 
 from .credentials import CertificateCredentials, Credentials
-from .helpers import IS_CELERY_WORKER
+from .helpers import is_celery_worker
 from .payload import Payload
 
 if TYPE_CHECKING:
-    from httpx import Response
+    from httpx import AsyncClient, Response
 
 T = TypeVar("T")
 
@@ -29,13 +44,115 @@ class NotificationType(Enum):
     MDM = "mdm"
 
 
-Notification = collections.namedtuple("Notification", ["token", "payload"])
+class Notification(NamedTuple):
+    token: str
+    # Already serialized JSON bytes are sent as they are
+    payload: Payload | bytes
+
 
 DEFAULT_APNS_PRIORITY = NotificationPriority.Immediate
 
+SUCCESS = "Success"
+
+# Push types implied by the last dot-separated component of the topic
+_TOPIC_SUFFIX_PUSH_TYPES = {
+    "voip": NotificationType.VoIP.value,
+    "complication": NotificationType.Complication.value,
+}
+
 logger = logging.getLogger(__name__)
 
 
+# orjson emits compact UTF-8 bytes directly, matching the stdlib serializer below
+_orjson_serializer = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _make_stdlib_serializer(json_encoder: type) -> Callable[[Any], bytes]:
+    def serialize(obj: Any) -> bytes:
+        return json.dumps(
+            obj, cls=json_encoder, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    return serialize
+
+
+@functools.lru_cache(maxsize=1024)
+def _push_type_for_topic(topic: str) -> str | None:
+    """
+    Return the push type implied by the topic suffix, if any.
+    Cached since an application sends to a handful of topics over and over.
+    """
+    if topic.endswith(".pushkit.fileprovider"):
+        return NotificationType.FileProvider.value
+    _, dot, suffix = topic.rpartition(".")
+    return _TOPIC_SUFFIX_PUSH_TYPES.get(suffix) if dot else None
+
+
+def _reason(data: dict[str, Any], default: str) -> str:
+    """
+    Return the error reason from an APNs response body, or the default.
+    Interned since a large batch repeats a handful of reasons many times.
+    """
+    reason = data.get("reason")
+    return sys.intern(reason) if reason and isinstance(reason, str) else default
+
+
+# Stream semaphores keyed by the pooled connection they guard, then by stream
+# limit. Clients sharing a cached connection with the same limit share one
+# bound, instead of each opening max_concurrent_streams streams on it.
+# Semaphores bind to the event loop they first block on, so each entry is
+# rebuilt when used from a different loop.
+_LoopSemaphore = tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+_STREAM_SEMAPHORES: weakref.WeakKeyDictionary[Any, dict[int, _LoopSemaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+_STREAM_SEMAPHORES_LOCK = threading.Lock()
+
+
+def _stream_semaphore(connection: Any, limit: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _STREAM_SEMAPHORES_LOCK:
+        by_limit = _STREAM_SEMAPHORES.setdefault(connection, {})
+        entry = by_limit.get(limit)
+        if entry is None or entry[0] is not loop:
+            entry = by_limit[limit] = (loop, asyncio.Semaphore(limit))
+        return entry[1]
+
+
+class _BackgroundLoop:
+    """
+    A single long-lived event loop running in a daemon thread.
+    Sync calls that can't use asyncio.run are submitted here, so the HTTP/2
+    connection pool and cached JWT survive between calls.
+    """
+
+    _lock = threading.Lock()
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="apns2-event-loop", daemon=True
+                )
+                thread.start()
+                cls._loop = loop
+            return cls._loop
+
+    @classmethod
+    def _reset(cls) -> None:
+        # A forked child inherits the loop but not the thread running it, and
+        # the lock may have been held by another parent thread at fork time
+        cls._lock = threading.Lock()
+        cls._loop = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_BackgroundLoop._reset)
+
+
 class APNsClient:
     SANDBOX_SERVER = "api.development.push.apple.com"
     LIVE_SERVER = "api.push.apple.com"
@@ -43,6 +160,30 @@ class APNsClient:
     DEFAULT_PORT = 443
     ALTERNATIVE_PORT = 2197
 
+    # APNs caps concurrent streams per connection, more in flight only queue up
+    DEFAULT_MAX_CONCURRENT_STREAMS = 500
+    # Distinct payloads remembered per batch so their serialized bytes are reused
+    PAYLOAD_CACHE_SIZE = 128
+    # Seconds before the first retry, doubled for every further attempt
+    RETRY_BACKOFF_BASE = 0.5
+    RETRY_BACKOFF_MAX = 30.0
+    # Seconds a sync call run on the background loop may take, on top of the
+    # time its retries can spend backing off
+    SYNC_TIMEOUT = 300.0
+
+    __slots__ = (
+        "_connection",
+        "_connection_args",
+        "_connection_loop",
+        "_credentials",
+        "_max_concurrent_streams",
+        "_max_retries",
+        "_port",
+        "_serialize",
+        "_server",
+        "_url_prefix",
+    )
+
     def __init__(
         self,
         credentials: Credentials | str,
@@ -53,19 +194,40 @@ class APNsClient:
         password: str | None = None,
         proxy_host: str | None = None,
         proxy_port: int | None = None,
+        max_concurrent_streams: int = DEFAULT_MAX_CONCURRENT_STREAMS,
+        max_retries: int = 0,
     ) -> None:
         if isinstance(credentials, str):
-            self.__credentials = CertificateCredentials(credentials, password)  # type: Credentials
+            self._credentials = CertificateCredentials(credentials, password)  # type: Credentials
         else:
-            self.__credentials = credentials
+            self._credentials = credentials
         self._init_connection(
             use_sandbox, use_alternative_port, proto, proxy_host, proxy_port
         )
 
-        self.__json_encoder = json_encoder
+        # orjson can't use a JSONEncoder subclass, custom encoders go through stdlib
+        self._serialize: Callable[[Any], bytes] = (
+            _orjson_serializer
+            if json_encoder is None
+            else _make_stdlib_serializer(json_encoder)
+        )
+
+        # Bounds the streams in flight on the shared connection, across every
+        # client using it with the same limit
+        self._max_concurrent_streams = max_concurrent_streams
+
+        # Throttled (429) and server error (5xx) responses are retried with
+        # exponential backoff, off unless asked for
+        self._max_retries = max_retries
+
+    @property
+    def credentials(self) -> Credentials:
+        return self._credentials
 
-        # Use the pre-computed Celery detection constant
-        self._is_celery_worker = IS_CELERY_WORKER
+    @property
+    def _is_celery_worker(self) -> bool:
+        # Detected on the first sync call and shared by all clients
+        return is_celery_worker()
 
     def _init_connection(
         self,
@@ -79,14 +241,33 @@ class APNsClient:
         self._port = (
             self.ALTERNATIVE_PORT if use_alternative_port else self.DEFAULT_PORT
         )
-        self._connection = self.__credentials.create_connection(
-            self._server, self._port, proto, proxy_host, proxy_port
+        self._url_prefix = f"https://{self._server}:{self._port}/3/device/"
+        # Looked up on first use, from the event loop that sends with it
+        self._connection_args = (
+            self._server,
+            self._port,
+            proto,
+            proxy_host,
+            proxy_port,
         )
+        self._connection: "AsyncClient | None" = None
+        self._connection_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_connection(self) -> "AsyncClient":
+        # Pools can't move between event loops, each loop gets its own
+        loop = asyncio.get_running_loop()
+        connection = self._connection
+        if connection is None or self._connection_loop is not loop:
+            connection = self._connection = self._credentials.create_connection(
+                *self._connection_args
+            )
+            self._connection_loop = loop
+        return connection
 
     def send_notification(
         self,
         token_hex: str,
-        notification: Payload,
+        notification: Payload | bytes,
         topic: str | None = None,
         priority: NotificationPriority = NotificationPriority.Immediate,
         expiration: int | None = None,
@@ -94,15 +275,14 @@ class APNsClient:
         push_type: NotificationType | None = None,
     ) -> str | tuple[str, str]:
         return self._run_async(
-            lambda: self.asend_notification(
-                token_hex,
-                notification,
-                topic,
-                priority,
-                expiration,
-                collapse_id,
-                push_type,
-            )
+            self.asend_notification,
+            token_hex,
+            notification,
+            topic,
+            priority,
+            expiration,
+            collapse_id,
+            push_type,
         )
 
     def send_notification_batch(
@@ -115,15 +295,19 @@ class APNsClient:
         push_type: NotificationType | None = None,
     ) -> dict[str, str | tuple[str, str]]:
         return self._run_async(
-            lambda: self.asend_notification_batch(
-                notifications, topic, priority, expiration, collapse_id, push_type
-            )
+            self.asend_notification_batch,
+            notifications,
+            topic,
+            priority,
+            expiration,
+            collapse_id,
+            push_type,
         )
 
     async def asend_notification(
         self,
         token_hex: str,
-        notification: Payload,
+        notification: Payload | bytes,
         topic: str | None = None,
         priority: NotificationPriority = NotificationPriority.Immediate,
         expiration: int | None = None,
@@ -138,51 +322,118 @@ class APNsClient:
 
     async def asend_notification_batch(
         self,
-        notifications: Iterable[Notification],
+        notifications: Iterable[Notification] | AsyncIterable[Notification],
         topic: str | None = None,
         priority: NotificationPriority = NotificationPriority.Immediate,
         expiration: int | None = None,
         collapse_id: str | None = None,
         push_type: NotificationType | None = None,
     ) -> dict[str, str | tuple[str, str]]:
-        notifications_list = list(notifications)
-        if not notifications_list:
-            return {}
+        logger.info("Starting async batch send")
 
-        logger.info(
-            f"Starting async batch send of {len(notifications_list)} notifications"
+        # Every header except a payload-inferred push type is the same for
+        # the whole batch, so build them once
+        headers = self._build_headers(
+            topic, priority, expiration, collapse_id, push_type
         )
+        infer_push_type = topic is not None and "apns-push-type" not in headers
 
-        # Create all async tasks at once for HTTP/2 multiplexing
-        tasks = [
-            self._send_single_notification(
-                notification, topic, priority, expiration, collapse_id, push_type
-            )
-            for notification in notifications_list
-        ]
+        # Notifications are streamed through a bounded queue to a pool of workers,
+        # so streams open as notifications arrive and only max_concurrent_streams
+        # of them are buffered or in flight at any time
+        results: dict[str, str | tuple[str, str]] = {}
+        queue: asyncio.Queue[tuple[str, bytes, dict[str, str]] | None] = asyncio.Queue(
+            self._max_concurrent_streams
+        )
 
-        logger.info(f"Created {len(tasks)} concurrent HTTP/2 streams")
+        async def worker() -> None:
+            while (item := await queue.get()) is not None:
+                token, result = await self._send_and_process(*item)
+                results[token] = result
+
+        # Serialize and classify each distinct payload object once, broadcasts
+        # usually share one. Entries keep their payload alive, so an id() can't
+        # be reused while cached. A payload that fails to encode is cached as
+        # None, so only its own tokens fail.
+        payload_cache: dict[
+            int, tuple[Payload | bytes, tuple[bytes, dict[str, str]] | None]
+        ] = {}
+        workers: list[asyncio.Task[None]] = []
+
+        async def feed(notification: Notification) -> None:
+            payload_id = id(notification.payload)
+            cached = payload_cache.get(payload_id)
+            if cached is None:
+                if len(payload_cache) >= self.PAYLOAD_CACHE_SIZE:
+                    del payload_cache[next(iter(payload_cache))]
+                encoded: tuple[bytes, dict[str, str]] | None
+                try:
+                    encoded = (
+                        self._serialize_payload(notification.payload),
+                        self._payload_headers(
+                            headers, notification.payload, infer_push_type
+                        ),
+                    )
+                except Exception as e:
+                    logger.error(f"Error encoding payload: {e}")
+                    encoded = None
+                cached = payload_cache[payload_id] = (notification.payload, encoded)
+            if cached[1] is None:
+                results[notification.token] = "InternalException"
+                return
+            if len(workers) < self._max_concurrent_streams:
+                workers.append(asyncio.create_task(worker()))
+            await queue.put((notification.token, *cached[1]))
 
-        # Execute all requests concurrently
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        async def finish_workers() -> None:
+            # Workers never raise, so they keep draining until their sentinel
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
 
-        # Process results
-        results: dict[str, str | tuple[str, str]] = {}
-        for notification, response in zip(notifications_list, responses):
-            if isinstance(response, Exception):
-                logger.error(
-                    f"Error sending notification to {notification.token}: {response}"
-                )
-                results[notification.token] = "InternalException"
-            else:
-                results[notification.token] = self._process_response(response)
-                logger.debug(
-                    f"Got result for {notification.token}: {results[notification.token]}"
-                )
+        try:
+            try:
+                if isinstance(notifications, AsyncIterable):
+                    async for notification in notifications:
+                        await feed(notification)
+                else:
+                    for notification in notifications:
+                        await feed(notification)
+            except Exception:
+                # Streams already queued or in flight finish before the input's
+                # error is raised
+                await finish_workers()
+                raise
+
+            logger.info(f"Started {len(workers)} concurrent HTTP/2 stream workers")
+            await finish_workers()
+        except asyncio.CancelledError:
+            # Only cancelling the batch itself cancels its streams
+            for task in workers:
+                task.cancel()
+            raise
 
         logger.info(f"Completed async batch send of {len(results)} notifications")
         return results
 
+    async def _send_and_process(
+        self,
+        token: str,
+        json_payload: bytes,
+        headers: dict[str, str],
+    ) -> tuple[str, str | tuple[str, str]]:
+        try:
+            response = await self._send_single_notification_raw(
+                token, json_payload, headers
+            )
+            result = self._process_response(response)
+        except Exception as e:
+            logger.error(f"Error sending notification to {token}: {e}")
+            return token, "InternalException"
+
+        logger.debug(f"Got result for {token}: {result}")
+        return token, result
+
     async def _send_single_notification(
         self,
         notification: Notification,
@@ -192,33 +443,42 @@ class APNsClient:
         collapse_id: str | None,
         push_type: NotificationType | None,
     ) -> "Response":
-        json_str = json.dumps(
-            notification.payload.dict(),
-            cls=self.__json_encoder,
-            ensure_ascii=False,
-            separators=(",", ":"),
+        headers = self._build_headers(
+            topic, priority, expiration, collapse_id, push_type
+        )
+        return await self._send_single_notification_raw(
+            notification.token,
+            self._serialize_payload(notification.payload),
+            self._payload_headers(
+                headers,
+                notification.payload,
+                topic is not None and "apns-push-type" not in headers,
+            ),
         )
-        json_payload = json_str.encode("utf-8")
 
-        headers = {}
+    def _serialize_payload(self, payload: Payload | bytes) -> bytes:
+        if isinstance(payload, bytes):
+            return payload
+        return self._serialize(payload.dict())
+
+    def _build_headers(
+        self,
+        topic: str | None,
+        priority: NotificationPriority,
+        expiration: int | None,
+        collapse_id: str | None,
+        push_type: NotificationType | None,
+    ) -> dict[str, str]:
+        """
+        Build the request headers shared by every notification sent with these options.
+        The push type is left out when it can only be inferred from the payload.
+        """
+        headers: dict[str, str] = {}
 
         inferred_push_type = None
         if topic is not None:
             headers["apns-topic"] = topic
-            if topic.endswith(".voip"):
-                inferred_push_type = NotificationType.VoIP.value
-            elif topic.endswith(".complication"):
-                inferred_push_type = NotificationType.Complication.value
-            elif topic.endswith(".pushkit.fileprovider"):
-                inferred_push_type = NotificationType.FileProvider.value
-            elif any([
-                notification.payload.alert is not None,
-                notification.payload.badge is not None,
-                notification.payload.sound is not None,
-            ]):
-                inferred_push_type = NotificationType.Alert.value
-            else:
-                inferred_push_type = NotificationType.Background.value
+            inferred_push_type = _push_type_for_topic(topic)
 
         if push_type:
             inferred_push_type = push_type.value
@@ -232,41 +492,103 @@ class APNsClient:
         if expiration is not None:
             headers["apns-expiration"] = "%d" % expiration
 
-        auth_header = self.__credentials.get_authorization_header(topic)
+        auth_header = self._credentials.get_authorization_header(topic)
         if auth_header is not None:
             headers["authorization"] = auth_header
 
         if collapse_id is not None:
             headers["apns-collapse-id"] = collapse_id
 
-        url = f"https://{self._server}:{self._port}/3/device/{notification.token}"
+        return headers
+
+    @classmethod
+    def _payload_headers(
+        cls, headers: dict[str, str], payload: Payload | bytes, infer_push_type: bool
+    ) -> dict[str, str]:
+        if not infer_push_type:
+            return headers
+        return {**headers, "apns-push-type": cls._payload_push_type(payload)}
+
+    @staticmethod
+    def _payload_push_type(payload: Payload | bytes) -> str:
+        if isinstance(payload, bytes):
+            try:
+                aps = orjson.loads(payload).get("aps", {})
+                is_alert = any(key in aps for key in ("alert", "badge", "sound"))
+            except (orjson.JSONDecodeError, AttributeError, TypeError):
+                # Bytes that aren't a JSON object with an aps object are sent
+                # as is, with the APNs default push type
+                return NotificationType.Alert.value
+        else:
+            is_alert = any([
+                payload.alert is not None,
+                payload.badge is not None,
+                payload.sound is not None,
+            ])
+        if is_alert:
+            return NotificationType.Alert.value
+        return NotificationType.Background.value
+
+    async def _send_single_notification_raw(
+        self,
+        token: str,
+        json_payload: bytes,
+        headers: dict[str, str],
+    ) -> "Response":
+        url = self._url_prefix + token
+
+        attempt = 0
+        while True:
+            # Multiple calls can execute concurrently as HTTP/2 streams
+            connection = self._get_connection()
+            async with _stream_semaphore(connection, self._max_concurrent_streams):
+                response = await connection.post(
+                    url, content=json_payload, headers=headers
+                )
+            if attempt >= self._max_retries or not self._is_retryable(response):
+                return response
+
+            # Backing off outside the semaphore leaves the stream to others
+            attempt += 1
+            await asyncio.sleep(self._retry_delay(attempt))
 
-        # Use self._connection directly - this is the key improvement
-        # Multiple calls can execute concurrently as HTTP/2 streams
-        response = await self._connection.post(
-            url, content=json_payload, headers=headers
+    def _retry_delay(self, attempt: int) -> float:
+        return min(
+            self.RETRY_BACKOFF_BASE * 2.0 ** (attempt - 1), self.RETRY_BACKOFF_MAX
         )
-        return response
+
+    def _sync_timeout(self) -> float:
+        # Retries back off outside the request itself, so a sync call's timeout
+        # leaves room for all of them instead of cancelling it mid-retry
+        backoff = sum(
+            self._retry_delay(attempt) for attempt in range(1, self._max_retries + 1)
+        )
+        return self.SYNC_TIMEOUT + backoff
+
+    @staticmethod
+    def _is_retryable(response: "Response") -> bool:
+        return response.status_code == 429 or response.status_code >= 500
 
     def _process_response(self, response: "Response") -> str | tuple[str, str]:
         if response.status_code == 200:
-            return "Success"
-        else:
-            try:
-                data = response.json()
-                if response.status_code == 410:
-                    reason = str(data.get("reason", "Unregistered"))
-                    timestamp = str(data.get("timestamp", ""))
-                    return reason, timestamp
-                else:
-                    return str(data.get("reason", "InternalException"))
-            except Exception:
-                return "InternalException"
-
-    def _run_async(self, coro_factory: Callable[[], Coroutine[Any, Any, T]]) -> T:
+            return SUCCESS
+        try:
+            data = orjson.loads(response.content)
+            if response.status_code == 410:
+                # APNs sends the timestamp as a number of milliseconds
+                return _reason(data, "Unregistered"), str(data.get("timestamp", ""))
+            return _reason(data, "InternalException")
+        except (orjson.JSONDecodeError, AttributeError):
+            # Not JSON, or JSON that isn't an object
+            return "InternalException"
+
+    def _run_async(
+        self, coro_func: Callable[..., Coroutine[Any, Any, T]], *args: Any
+    ) -> T:
         """
         Run an async coroutine from a sync context in the most robust way possible.
-        Takes a function that creates a fresh coroutine each time to avoid reuse issues.
+        Takes the coroutine function and its arguments so a fresh coroutine can be
+        created for each attempt; the common asyncio.run path calls it directly.
         Handles all possible event loop scenarios to prevent any asyncio-related errors.
 
         Special handling for Celery: Uses separate thread strategy to avoid memory leaks
@@ -274,21 +596,21 @@ class APNsClient:
         """
         # Special case: If running in Celery, always use separate thread to avoid memory leaks
         if self._is_celery_worker:
-            return self._run_in_separate_thread(coro_factory)
+            return self._run_in_separate_thread(functools.partial(coro_func, *args))
 
         # Strategy 1: Try to detect if we're in an async context
         try:
             asyncio.get_running_loop()
             # We're in an async context - must use a separate thread
-            return self._run_in_separate_thread(coro_factory)
+            return self._run_in_separate_thread(functools.partial(coro_func, *args))
         except RuntimeError:
             # No running event loop - we can proceed with direct execution
             pass
 
         # Strategy 2: Try to use asyncio.run (safest for most cases)
+        # The retry factory is only built on the fallback paths below
         try:
-            fresh_coro = coro_factory()
-            return asyncio.run(fresh_coro)
+            return asyncio.run(coro_func(*args))
         except RuntimeError as e:
             error_msg = str(e).lower()
             # Handle various event loop related errors
@@ -302,57 +624,25 @@ class APNsClient:
                 ]
             ):
                 # Fall back to manual event loop management
-                return self._run_with_manual_loop(coro_factory)
+                return self._run_with_manual_loop(functools.partial(coro_func, *args))
             else:
                 # Unknown RuntimeError, try thread approach as last resort
-                return self._run_in_separate_thread(coro_factory)
+                return self._run_in_separate_thread(functools.partial(coro_func, *args))
         except Exception:
             # Any other exception, try thread approach as last resort
-            return self._run_in_separate_thread(coro_factory)
+            return self._run_in_separate_thread(functools.partial(coro_func, *args))
 
     def _run_in_separate_thread(
         self, coro_factory: Callable[[], Coroutine[Any, Any, T]]
     ) -> T:
-        """Run coroutine in a completely isolated thread with its own event loop."""
-        import threading
-
-        result: T | None = None
-        exception: Exception | None = None
-
-        def run_in_thread() -> None:
-            nonlocal result, exception
-            try:
-                # Create completely isolated event loop in this thread
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    fresh_coro = coro_factory()
-                    result = new_loop.run_until_complete(fresh_coro)
-                finally:
-                    # Clean up properly
-                    try:
-                        new_loop.close()
-                    except Exception:
-                        pass  # Ignore cleanup errors
-                    try:
-                        asyncio.set_event_loop(None)
-                    except Exception:
-                        pass  # Ignore cleanup errors
-            except Exception as e:
-                exception = e
-
-        thread = threading.Thread(target=run_in_thread, daemon=True)
-        thread.start()
-        thread.join(timeout=300)  # 5 minute timeout to prevent hanging
-
-        if thread.is_alive():
-            raise RuntimeError("Async operation timed out after 5 minutes")
-
-        if exception:
-            raise exception
-        if result is None:
-            raise RuntimeError("Failed to get result from async operation")
-        return result
+        """Run coroutine on the shared background event loop thread."""
+        future = asyncio.run_coroutine_threadsafe(coro_factory(), _BackgroundLoop.get())
+        timeout = self._sync_timeout()
+        try:
+            return future.result(timeout=timeout)  # Timeout to prevent hanging
+        except TimeoutError:
+            future.cancel()
+            raise RuntimeError(f"Async operation timed out after {timeout:.0f} seconds")
 
     def _run_with_manual_loop(
         self, coro_factory: Callable[[], Coroutine[Any, Any, T]]
@@ -1,18 +1,62 @@
+import asyncio
+import atexit
+import base64
+import functools
 import ssl
+import threading
 import time
+import weakref
+from collections import OrderedDict
+from typing import Hashable
 
 import httpx
 import jwt
+import orjson
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
 
 DEFAULT_TOKEN_LIFETIME = 2700
 DEFAULT_TOKEN_ENCRYPTION_ALGORITHM = "ES256"
 
+# Shared connection pools per event loop, then keyed by (server, port, TLS
+# settings, proxy). httpx connections belong to the loop that opened them, so
+# APNsClient instances only share a pool when they send from the same loop, and
+# a loop's pools are dropped along with it. Each loop keeps its most recently
+# used pools, any client still holding an evicted one goes on using it.
+_ConnectionKey = tuple[str, int, Hashable, str | None]
+_CLIENT_CACHE: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, OrderedDict[_ConnectionKey, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_CLIENT_CACHE_LOCK = threading.Lock()
+_CLIENT_CACHE_SIZE = 16
+
+
+def _close_cached_clients() -> None:
+    for pools in list(_CLIENT_CACHE.values()):
+        for client in pools.values():
+            try:
+                asyncio.run(client.aclose())
+            except Exception:
+                pass  # Ignore cleanup errors at interpreter shutdown
+    _CLIENT_CACHE.clear()
+
+
+atexit.register(_close_cached_clients)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
 
 # Abstract Base class. This should not be instantiated directly.
 class Credentials:
     def __init__(self, ssl_context: ssl.SSLContext | None = None) -> None:
         super().__init__()
         self.__ssl_context = ssl_context
+        # Identifies the TLS settings in the pool cache, subclasses that build
+        # their context from files key it by those instead
+        self._tls_key: Hashable = ssl_context
 
     # Creates a connection with the credentials, if available or necessary.
     def create_connection(
@@ -27,6 +71,25 @@ class Credentials:
         if proxy_host and proxy_port:
             proxies = f"http://{proxy_host}:{proxy_port}"
 
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # The loop this will be used from is unknown, so it isn't shared
+            return self._new_connection(proxies)
+
+        key = (server, port, self._tls_key, proxies)
+        with _CLIENT_CACHE_LOCK:
+            pools = _CLIENT_CACHE.setdefault(loop, OrderedDict())
+            client = pools.get(key)
+            if client is not None and not client.is_closed:
+                pools.move_to_end(key)
+                return client
+            client = pools[key] = self._new_connection(proxies)
+            if len(pools) > _CLIENT_CACHE_SIZE:
+                pools.popitem(last=False)
+        return client
+
+    def _new_connection(self, proxies: str | None) -> httpx.AsyncClient:
         return httpx.AsyncClient(
             http2=True,
             verify=self.__ssl_context if self.__ssl_context else True,
@@ -58,6 +121,8 @@ class CertificateCredentials(Credentials):
         if cert_chain:
             ssl_context.load_cert_chain(cert_chain)
         super(CertificateCredentials, self).__init__(ssl_context)
+        # Each instance builds a new context, so pools are shared by certificate
+        self._tls_key = (cert_file, password, cert_chain)
 
 
 # Credentials subclass for JWT token based authentication
@@ -76,17 +141,23 @@ class TokenCredentials(Credentials):
         self.__encryption_algorithm = encryption_algorithm
         self.__token_lifetime = token_lifetime
 
-        self.__jwt_token: tuple[float, str] | None = None
+        # ES256 tokens are signed directly with cryptography, skipping PyJWT's
+        # per-token header handling; other algorithms still go through jwt.encode
+        self.__es256_key: ec.EllipticCurvePrivateKey | None = None
+        if encryption_algorithm == "ES256":
+            self.__es256_key = self._load_es256_key(self.__auth_key)
+            self.__es256_header = _b64url(
+                orjson.dumps({"alg": "ES256", "typ": "JWT", "kid": auth_key_id})
+            )
+
+        # (monotonic expiry time, JWT token, authorization header)
+        self.__jwt_token: tuple[float, str, str] | None = None
 
         # Use the default constructor because we don't have an SSL context
         super(TokenCredentials, self).__init__()
 
     def get_authorization_header(self, topic: str | None) -> str:
-        token = self._get_or_create_topic_token()
-        return "bearer %s" % token
-
-    def _is_expired_token(self, issue_date: float) -> bool:
-        return time.time() > issue_date + self.__token_lifetime
+        return self._get_or_create_topic_token()[2]
 
     @staticmethod
     def _get_signing_key(key_path: str) -> str:
@@ -96,32 +167,58 @@ class TokenCredentials(Credentials):
                 secret = f.read()
         return secret
 
-    def _get_or_create_topic_token(self) -> str:
-        # dict of topic to issue date and JWT token
-        token_pair = self.__jwt_token
-        if token_pair is None or self._is_expired_token(token_pair[0]):
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _load_es256_key(secret: str) -> ec.EllipticCurvePrivateKey | None:
+        # Cached by PEM contents, so credentials sharing a key parse it once
+        try:
+            key = serialization.load_pem_private_key(secret.encode(), password=None)
+        except (ValueError, TypeError):
+            return None  # Let jwt.encode report the problem when signing
+        if isinstance(key, ec.EllipticCurvePrivateKey) and isinstance(
+            key.curve, ec.SECP256R1
+        ):
+            return key
+        return None
+
+    def _encode_es256(
+        self, key: ec.EllipticCurvePrivateKey, claims: dict[str, object]
+    ) -> str:
+        signing_input = self.__es256_header + b"." + _b64url(orjson.dumps(claims))
+        r, s = decode_dss_signature(key.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
+    def _get_or_create_topic_token(self) -> tuple[float, str, str]:
+        token_info = self.__jwt_token
+        # Expiry uses the monotonic clock so wall clock adjustments can't extend it
+        if token_info is None or time.monotonic() >= token_info[0]:
             # Create a new token
             issued_at = time.time()
-            token_dict = {
+            token_dict: dict[str, object] = {
                 "iss": self.__team_id,
                 "iat": issued_at,
             }
-            headers = {
-                "alg": self.__encryption_algorithm,
-                "kid": self.__auth_key_id,
-            }
-            jwt_token = str(
-                jwt.encode(
-                    token_dict,
-                    self.__auth_key,
-                    algorithm=self.__encryption_algorithm,
-                    headers=headers,
+            if self.__es256_key is not None:
+                jwt_token = self._encode_es256(self.__es256_key, token_dict)
+            else:
+                headers = {
+                    "alg": self.__encryption_algorithm,
+                    "kid": self.__auth_key_id,
+                }
+                jwt_token = str(
+                    jwt.encode(
+                        token_dict,
+                        self.__auth_key,
+                        algorithm=self.__encryption_algorithm,
+                        headers=headers,
+                    )
                 )
-            )
 
             # Cache JWT token for later use. One JWT token per connection.
             # https://developer.apple.com/documentation/usernotifications/setting_up_a_remote_notification_server/establishing_a_token-based_connection_to_apns
-            self.__jwt_token = (issued_at, jwt_token)
-            return jwt_token
-        else:
-            return token_pair[1]
+            # The header string is built once per token rather than per request.
+            expires_at = time.monotonic() + self.__token_lifetime
+            token_info = (expires_at, jwt_token, "bearer %s" % jwt_token)
+            self.__jwt_token = token_info
+        return token_info
@@ -192,34 +192,38 @@ class Shutdown(APNsException):
     pass
 
 
+# APNs error reasons and their exception classes, built once at import time
+EXCEPTION_CLASS_MAP: dict[str, type[APNsException]] = {
+    "BadCollapseId": BadCollapseId,
+    "BadDeviceToken": BadDeviceToken,
+    "BadExpirationDate": BadExpirationDate,
+    "BadMessageId": BadMessageId,
+    "BadPriority": BadPriority,
+    "BadTopic": BadTopic,
+    "DeviceTokenNotForTopic": DeviceTokenNotForTopic,
+    "DuplicateHeaders": DuplicateHeaders,
+    "IdleTimeout": IdleTimeout,
+    "MissingDeviceToken": MissingDeviceToken,
+    "MissingTopic": MissingTopic,
+    "PayloadEmpty": PayloadEmpty,
+    "TopicDisallowed": TopicDisallowed,
+    "BadCertificate": BadCertificate,
+    "BadCertificateEnvironment": BadCertificateEnvironment,
+    "ExpiredProviderToken": ExpiredProviderToken,
+    "Forbidden": Forbidden,
+    "InvalidProviderToken": InvalidProviderToken,
+    "MissingProviderToken": MissingProviderToken,
+    "BadPath": BadPath,
+    "MethodNotAllowed": MethodNotAllowed,
+    "Unregistered": Unregistered,
+    "PayloadTooLarge": PayloadTooLarge,
+    "TooManyProviderTokenUpdates": TooManyProviderTokenUpdates,
+    "TooManyRequests": TooManyRequests,
+    "InternalServerError": InternalServerError,
+    "ServiceUnavailable": ServiceUnavailable,
+    "Shutdown": Shutdown,
+}
+
+
 def exception_class_for_reason(reason: str) -> type[APNsException]:
-    return {
-        "BadCollapseId": BadCollapseId,
-        "BadDeviceToken": BadDeviceToken,
-        "BadExpirationDate": BadExpirationDate,
-        "BadMessageId": BadMessageId,
-        "BadPriority": BadPriority,
-        "BadTopic": BadTopic,
-        "DeviceTokenNotForTopic": DeviceTokenNotForTopic,
-        "DuplicateHeaders": DuplicateHeaders,
-        "IdleTimeout": IdleTimeout,
-        "MissingDeviceToken": MissingDeviceToken,
-        "MissingTopic": MissingTopic,
-        "PayloadEmpty": PayloadEmpty,
-        "TopicDisallowed": TopicDisallowed,
-        "BadCertificate": BadCertificate,
-        "BadCertificateEnvironment": BadCertificateEnvironment,
-        "ExpiredProviderToken": ExpiredProviderToken,
-        "Forbidden": Forbidden,
-        "InvalidProviderToken": InvalidProviderToken,
-        "MissingProviderToken": MissingProviderToken,
-        "BadPath": BadPath,
-        "MethodNotAllowed": MethodNotAllowed,
-        "Unregistered": Unregistered,
-        "PayloadTooLarge": PayloadTooLarge,
-        "TooManyProviderTokenUpdates": TooManyProviderTokenUpdates,
-        "TooManyRequests": TooManyRequests,
-        "InternalServerError": InternalServerError,
-        "ServiceUnavailable": ServiceUnavailable,
-        "Shutdown": Shutdown,
-    }[reason]
+    return EXCEPTION_CLASS_MAP[reason]
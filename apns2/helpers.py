@@ -1,66 +1,67 @@
+import functools
 import logging
 import os
 import sys
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    pass
+    IS_CELERY_WORKER: bool
 
 logger = logging.getLogger(__name__)
 
 
+# Environment variables that Celery workers set
+CELERY_ENV_VARS = frozenset([
+    "CELERY_LOADER",
+    "CELERY_WORKER_DIRECT",
+    "CELERY_CURRENT_TASK",
+    "C_FORCE_ROOT",
+    "CELERY_WORKER_POOL",
+    "CELERY_WORKER_CONCURRENCY",
+    "CELERY_WORKER_LOGLEVEL",
+])
+
+
 def _is_celery_worker() -> bool:
     """
     Detect if we're running inside a Celery worker.
     This helps avoid memory leaks caused by Celery's poor async support.
+    Checks run cheapest first.
     """
     logger.info("Detecting if running in Celery worker environment...")
 
-    # Check environment variables that Celery workers set
-    celery_env_vars = [
-        "CELERY_LOADER",
-        "CELERY_WORKER_DIRECT",
-        "CELERY_CURRENT_TASK",
-        "C_FORCE_ROOT",
-        "CELERY_WORKER_POOL",
-        "CELERY_WORKER_CONCURRENCY",
-        "CELERY_WORKER_LOGLEVEL",
-    ]
-    if any(key in os.environ for key in celery_env_vars):
+    if not CELERY_ENV_VARS.isdisjoint(os.environ.keys()):
         return True
 
     # Check if we're in a process that looks like a Celery worker
     try:
-        if "celery" in sys.argv[0].lower():
-            return True
         if any("celery" in arg.lower() for arg in sys.argv):
             return True
     except (AttributeError, IndexError):
         pass
 
-    # Check if celery modules are in the call stack
-    try:
-        import inspect
-
-        for frame_info in inspect.stack():
-            filename = frame_info.filename.lower()
-            if "celery" in filename and ("worker" in filename or "task" in filename):
-                return True
-    except Exception:
-        pass
-
     # Check if current task context exists (most reliable for active tasks)
     try:
         from celery import current_task
 
-        if current_task is not None and callable(current_task):
-            task = current_task()
-            if task is not None:
-                return True
+        if current_task and getattr(current_task, "request", None) is not None:
+            return True
     except (ImportError, RuntimeError, TypeError):
         # RuntimeError: No active Celery app
         pass
 
+    return False
+
+
+@functools.cache
+def is_celery_worker() -> bool:
+    """Celery detection result, computed once on first use."""
+    return _is_celery_worker()
+
 
-# Constant that gets computed once when the module is imported
-IS_CELERY_WORKER: bool = _is_celery_worker()
+def __getattr__(name: str) -> Any:
+    # IS_CELERY_WORKER is resolved on first access rather than at import time,
+    # so async-only users never run the detection
+    if name == "IS_CELERY_WORKER":
+        return is_celery_worker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+import logging
+import os
+from typing import Any, Iterator
+
+import pytest
+
+from apns2.payload import Payload
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Opt-in, so the default run always exercises the real Payload.dict()
+CACHE_PAYLOAD_DICTS = os.environ.get("APNS2_TEST_CACHE_PAYLOAD_DICTS") == "1"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_logging() -> Iterator[None]:
+    """Drop log records at the source, no test asserts on log output."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(autouse=True)
+def _cached_payload_dicts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reuse Payload.dict() results for payload objects a test sends repeatedly."""
+    if not CACHE_PAYLOAD_DICTS:
+        return
+
+    original = Payload.dict
+    # The cache lives for one test and holds on to every payload it has seen,
+    # so a payload freed mid-test can't hand its id() to a new one
+    cache: dict[int, tuple[Payload, dict[str, Any]]] = {}
+
+    def cached_dict(self: Payload) -> dict[str, Any]:
+        entry = cache.get(id(self))
+        if entry is None:
+            entry = cache[id(self)] = (self, original(self))
+        return entry[1]
+
+    monkeypatch.setattr(Payload, "dict", cached_dict)
+
+
+if uvloop is not None:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(
+        config: pytest.Config, item: pytest.Item
+    ) -> dict[str, Any]:
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
@@ -1,66 +1,205 @@
-from typing import Any
+import asyncio
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, cast
 from unittest.mock import AsyncMock, Mock, patch
 
+import orjson
 import pytest
+from httpx import Response
 
 from apns2.client import (
+    _BackgroundLoop,
+    _push_type_for_topic,
     APNsClient,
     Notification,
     NotificationPriority,
     NotificationType,
 )
 from apns2.credentials import Credentials
+from apns2.helpers import IS_CELERY_WORKER
 from apns2.payload import Payload
 
-TOPIC: str = "com.example.App"
+TOPIC: str = sys.intern("com.example.App")
+_DEVICE_TOKEN = "1" * 64
+_OTHER_DEVICE_TOKEN = "2" * 64
+_PRI_DELAYED = NotificationPriority.Delayed
+_TYPE_ALERT = NotificationType.Alert
+
+# Shared by the tests that only need an alert or a background payload, none of
+# them modify it
+_TEST_PAYLOAD = Payload(alert="Test message")
+_BACKGROUND_PAYLOAD = Payload(content_available=True)
+
+# Response bodies shared by many tests, serialized once and immutable
+_SUCCESS_BODY: bytes = orjson.dumps({})
+_BAD_TOKEN_BODY: bytes = orjson.dumps({"reason": "BadDeviceToken"})
+_UNREGISTERED_BODY: bytes = orjson.dumps({
+    "reason": "Unregistered",
+    "timestamp": 1234567890,
+})
+
+
+_BATCH_SIZES = (10, 100, 1000)
 
 
 @pytest.fixture(scope="session")
-def tokens() -> list[str]:
-    return ["%064x" % i for i in range(10)]  # Reducido para tests más rápidos
+def token_pool() -> tuple[str, ...]:
+    # Formatted once for the largest batch, smaller batches take a prefix
+    return tuple(f"{i:064x}" for i in range(max(_BATCH_SIZES)))
+
+
+# Batch tests run at several sizes so super-linear slowdowns show up
+@pytest.fixture(
+    scope="session",
+    params=[
+        pytest.param(n, marks=pytest.mark.slow) if n >= 1000 else n
+        for n in _BATCH_SIZES
+    ],
+    ids=lambda n: f"{n}-tokens",
+)
+def tokens(request: pytest.FixtureRequest, token_pool: tuple[str, ...]) -> list[str]:
+    return list(token_pool[: request.param])
 
 
 @pytest.fixture(scope="session")
-def notifications(tokens: list[str]) -> list[Notification]:
-    payload = Payload(alert="Test alert")
-    return [Notification(token=token, payload=payload) for token in tokens]
+def payload_bytes() -> bytes:
+    return orjson.dumps(Payload(alert="Test alert").dict())
+
+
+@pytest.fixture(scope="session")
+def notifications(tokens: list[str], payload_bytes: bytes) -> list[Notification]:
+    return [Notification(token=token, payload=payload_bytes) for token in tokens]
+
+
+@pytest.fixture(scope="session")
+def mixed_notifications(token_pool: tuple[str, ...]) -> list[Notification]:
+    # Only three tokens are needed, so this doesn't run at every batch size
+    return [
+        Notification(token=token_pool[i], payload=Payload(alert=f"Test {i + 1}"))
+        for i in range(3)
+    ]
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    status_code: int
+    content: bytes
+
+
+def _fake_connection() -> Mock:
+    """A plain Mock connection where only the awaited ``post`` is async."""
+    connection = Mock()
+    connection.post = AsyncMock()
+    return connection
+
 
+@dataclass(slots=True)
+class FakeCredentials(Credentials):
+    """Just enough of Credentials for APNsClient, without Mock's spec checks."""
 
-@pytest.fixture
-def mock_credentials() -> Mock:
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
+    connection: Mock = field(default_factory=_fake_connection)
+    response: FakeResponse = field(default_factory=lambda: _resp(200, _SUCCESS_BODY))
+    authorization_header: str | None = None
+    connections_created: int = 0
+    authorization_topics: list[str | None] = field(default_factory=list)
 
-    # Mock the post method to return a successful response
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
+    def __post_init__(self) -> None:
+        # Bound once, tests change the answer by updating the response in place
+        self.connection.post.return_value = self.response
 
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    def respond(self, status_code: int, body: Any) -> None:
+        """Make every POST answer with ``status_code`` and ``body``."""
+        self.response.status_code = status_code
+        self.response.content = _encode_body(body)
 
-    return credentials
+    def create_connection(self, *args: Any, **kwargs: Any) -> Mock:  # type: ignore[override]
+        self.connections_created += 1
+        return self.connection
 
+    def get_authorization_header(self, topic: str | None) -> str | None:
+        self.authorization_topics.append(topic)
+        return self.authorization_header
 
-@pytest.fixture
-def client(mock_credentials: Mock) -> APNsClient:
+
+def _encode_body(body: Any) -> bytes:
+    return body if isinstance(body, bytes) else orjson.dumps(body)
+
+
+def _resp(status_code: int, body: Any) -> FakeResponse:
+    """Build a response whose body is ``body`` as JSON, or as is when it is bytes."""
+    return FakeResponse(status_code, _encode_body(body))
+
+
+def _token_from(url: str) -> str:
+    """Return the device token at the end of a ``/3/device/<token>`` URL."""
+    return url.rsplit("/", 1)[-1]
+
+
+def _headers(connection: Mock) -> dict[str, str]:
+    """Return the headers of the last POST made over ``connection``."""
+    return cast(dict[str, str], connection.post.call_args.kwargs["headers"])
+
+
+def _url(connection: Mock) -> str:
+    """Return the URL of the last POST made over ``connection``."""
+    return cast(str, connection.post.call_args.args[0])
+
+
+def _make_client(
+    status_code: int = 200,
+    body: Any = _SUCCESS_BODY,
+    auth_header: str | None = None,
+    **options: Any,
+) -> tuple[APNsClient, Mock]:
+    """Build a client with its own fake credentials, for non-default options."""
+    credentials = FakeCredentials(authorization_header=auth_header)
+    credentials.respond(status_code, body)
+    return APNsClient(credentials=credentials, **options), credentials.connection
+
+
+@pytest.fixture(scope="session")
+def real_credentials() -> Credentials:
+    # Connections are cached per credentials, so the real httpx clients and
+    # their TLS contexts are only built once per session
+    return Credentials()
+
+
+@pytest.fixture(scope="session")
+def mock_credentials() -> FakeCredentials:
+    return FakeCredentials()
+
+
+@pytest.fixture(scope="session")
+def client(mock_credentials: FakeCredentials) -> APNsClient:
     return APNsClient(credentials=mock_credentials)
 
 
-def test_celery_detection_optimization() -> None:
-    """Test that Celery detection uses the pre-computed constant."""
-    mock_credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_credentials.create_connection.return_value = mock_connection
+@pytest.fixture(autouse=True)
+def _reset_mock_credentials(mock_credentials: FakeCredentials) -> None:
+    """Give each test a clean view of the shared credentials and connection."""
+    mock_credentials.connection.reset_mock(return_value=False, side_effect=True)
+    mock_credentials.authorization_header = None
+    mock_credentials.connections_created = 0
+    mock_credentials.authorization_topics.clear()
+    mock_credentials.respond(200, _SUCCESS_BODY)
+
 
-    # Import the constant to verify it exists and is accessible
-    from apns2.helpers import IS_CELERY_WORKER
+def test_client_uses_slots(client: APNsClient) -> None:
+    """Test that APNsClient instances have no per-instance __dict__."""
+    assert not hasattr(client, "__dict__")
 
-    # Verify the constant is a boolean
+
+def test_celery_detection_optimization() -> None:
+    """Test that clients report the Celery detection result from apns2.helpers."""
+    mock_credentials = FakeCredentials()
+
+    # Reading IS_CELERY_WORKER runs the detection once, later reads reuse it
     assert isinstance(IS_CELERY_WORKER, bool)
 
-    # Create clients and verify they use the constant
+    # Create clients and verify they see the same cached result
     client1 = APNsClient(credentials=mock_credentials)
     client2 = APNsClient(credentials=mock_credentials)
 
@@ -71,29 +210,27 @@ def test_celery_detection_optimization() -> None:
 
 
 def test_multiple_clients_performance() -> None:
-    """Test that creating multiple clients is efficient (uses pre-computed constant)."""
-    from apns2.helpers import IS_CELERY_WORKER
-
-    mock_credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_credentials.create_connection.return_value = mock_connection
+    """Test that many clients share one detection result instead of each detecting."""
+    mock_credentials = FakeCredentials()
 
-    # Create 10 clients - all should use the same pre-computed constant
+    # Create 10 clients, detection runs on first use and is cached for all of them
     clients = []
     for i in range(10):
         client = APNsClient(credentials=mock_credentials)
         clients.append(client)
 
-    # Verify all clients have the same result (from the constant)
+    # Verify all clients have the same, cached result
     expected_result = IS_CELERY_WORKER
     for client in clients:
         assert client._is_celery_worker == expected_result
 
 
-def test_client_initialization_with_different_options() -> None:
+def test_client_initialization_with_different_options(
+    real_credentials: Credentials,
+) -> None:
     """Test APNsClient initialization with various configuration options."""
     # Test basic initialization
-    credentials = Credentials()
+    credentials = real_credentials
     client = APNsClient(credentials=credentials)
     assert client._server == APNsClient.LIVE_SERVER
     assert client._port == APNsClient.DEFAULT_PORT
@@ -114,132 +251,110 @@ def test_client_initialization_with_different_options() -> None:
     assert client_both._port == APNsClient.ALTERNATIVE_PORT
 
 
-def test_send_notification_success(client: APNsClient, mock_credentials: Mock) -> None:
-    """Test sending a single notification successfully."""
-    token = "1" * 64
-    payload = Payload(alert="Test message")
+@pytest.mark.parametrize(
+    ("status_code", "body", "payload", "expected"),
+    [
+        pytest.param(200, _SUCCESS_BODY, _TEST_PAYLOAD, "Success", id="success"),
+        pytest.param(
+            400, _BAD_TOKEN_BODY, _TEST_PAYLOAD, "BadDeviceToken", id="error-response"
+        ),
+        pytest.param(
+            410,
+            _UNREGISTERED_BODY,
+            _TEST_PAYLOAD,
+            ("Unregistered", "1234567890"),
+            id="410-response",
+        ),
+        pytest.param(
+            400, b"Invalid JSON", _TEST_PAYLOAD, "InternalException", id="invalid-json"
+        ),
+        pytest.param(
+            413,
+            {"reason": "PayloadTooLarge"},
+            # Larger than the 4KB APNs limit
+            Payload(alert="Test", custom={"large_data": "x" * 5000}),
+            "PayloadTooLarge",
+            id="payload-too-large",
+        ),
+    ],
+)
+def test_send_notification(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    status_code: int,
+    body: Any,
+    payload: Payload,
+    expected: str | tuple[str, str],
+) -> None:
+    """Test that single notification responses map to the expected result."""
+    token = _DEVICE_TOKEN
 
-    # Mock successful response
-    mock_connection = mock_credentials.create_connection.return_value
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
+    mock_connection = mock_credentials.connection
+    mock_credentials.respond(status_code, body)
 
     result = client.send_notification(token, payload, TOPIC)
-    assert result == "Success"
+    assert result == expected
 
     # Verify the connection was called
     mock_connection.post.assert_called_once()
 
 
-def test_send_notification_error_response(
-    client: APNsClient, mock_credentials: Mock
-) -> None:
-    """Test handling error responses from APNs."""
-    token = "1" * 64
-    payload = Payload(alert="Test message")
-
-    # Mock error response
-    mock_connection = mock_credentials.create_connection.return_value
-    mock_response = Mock()
-    mock_response.status_code = 400
-    mock_response.json.return_value = {"reason": "BadDeviceToken"}
-    mock_connection.post.return_value = mock_response
-
-    result = client.send_notification(token, payload, TOPIC)
-    assert result == "BadDeviceToken"
-
-
-def test_send_notification_410_response(
-    client: APNsClient, mock_credentials: Mock
-) -> None:
-    """Test handling 410 (Gone) responses with timestamp."""
-    token = "1" * 64
-    payload = Payload(alert="Test message")
-
-    # Mock 410 response
-    mock_connection = mock_credentials.create_connection.return_value
-    mock_response = Mock()
-    mock_response.status_code = 410
-    mock_response.json.return_value = {
-        "reason": "Unregistered",
-        "timestamp": 1234567890,
-    }
-    mock_connection.post.return_value = mock_response
-
-    result = client.send_notification(token, payload, TOPIC)
-    assert result == ("Unregistered", "1234567890")
-
-
 def test_send_empty_batch_returns_empty_dict(
-    client: APNsClient, mock_credentials: Mock
+    client: APNsClient, mock_credentials: FakeCredentials
 ) -> None:
     """Test that sending an empty batch returns an empty dictionary."""
     results = client.send_notification_batch([], TOPIC)
     assert results == {}
 
 
-def test_send_notification_batch_success(
+@pytest.mark.asyncio
+async def test_send_notification_batch_success(
     client: APNsClient,
-    mock_credentials: Mock,
+    mock_credentials: FakeCredentials,
     tokens: list[str],
     notifications: list[Notification],
 ) -> None:
     """Test sending a batch of notifications successfully."""
-    # Mock successful responses for all notifications
-    mock_connection = mock_credentials.create_connection.return_value
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
+    # The shared connection answers 200 by default
+    mock_connection = mock_credentials.connection
 
-    results = client.send_notification_batch(notifications, TOPIC)
+    results = await client.asend_notification_batch(notifications, TOPIC)
 
     # All notifications should succeed
-    expected_results = {token: "Success" for token in tokens}
+    expected_results = dict.fromkeys(tokens, "Success")
     assert results == expected_results
 
-    # Should have called post for each notification
+    # Should have called post for each notification over one connection, looked
+    # up once for this test's event loop
     assert mock_connection.post.call_count == len(notifications)
+    assert mock_credentials.connections_created == 1
 
 
-def test_send_notification_batch_mixed_results(
-    client: APNsClient, mock_credentials: Mock, tokens: list[str]
+@pytest.mark.asyncio
+async def test_send_notification_batch_mixed_results(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    mixed_notifications: list[Notification],
 ) -> None:
     """Test batch sending with mixed success/error results."""
-    notifications = [
-        Notification(token=tokens[0], payload=Payload(alert="Test 1")),
-        Notification(token=tokens[1], payload=Payload(alert="Test 2")),
-        Notification(token=tokens[2], payload=Payload(alert="Test 3")),
-    ]
+    notifications = mixed_notifications
+    tokens = [notification.token for notification in notifications]
+
+    mock_connection = mock_credentials.connection
 
-    mock_connection = mock_credentials.create_connection.return_value
-
-    # Define different responses for each call based on URL
-    def mock_post_url_check(url: str, **kwargs: Any) -> Mock:
-        if tokens[0] in url:
-            response = Mock()
-            response.status_code = 200
-            response.json.return_value = {}
-            return response
-        elif tokens[1] in url:
-            response = Mock()
-            response.status_code = 400
-            response.json.return_value = {"reason": "BadDeviceToken"}
-            return response
-        else:  # tokens[2]
-            response = Mock()
-            response.status_code = 410
-            response.json.return_value = {
-                "reason": "Unregistered",
-                "timestamp": 1234567890,
-            }
-            return response
+    # Each device token gets its own response, looked up from the URL path
+    responses = {
+        tokens[0]: _resp(200, _SUCCESS_BODY),
+        tokens[1]: _resp(400, _BAD_TOKEN_BODY),
+        tokens[2]: _resp(410, _UNREGISTERED_BODY),
+    }
+
+    def mock_post_url_check(url: str, **kwargs: Any) -> FakeResponse:
+        return responses[_token_from(url)]
 
     mock_connection.post.side_effect = mock_post_url_check
 
-    results = client.send_notification_batch(notifications, TOPIC)
+    results = await client.asend_notification_batch(notifications, TOPIC)
 
     expected_results = {
         tokens[0]: "Success",
@@ -249,95 +364,47 @@ def test_send_notification_batch_mixed_results(
     assert results == expected_results
 
 
-def test_send_notification_json_exception_handling(
-    client: APNsClient, mock_credentials: Mock
+def test_notification_priority_and_type_inference(
+    client: APNsClient, mock_credentials: FakeCredentials
 ) -> None:
-    """Test handling JSON parsing exceptions."""
-    token = "1" * 64
-    payload = Payload(alert="Test message")
-
-    # Mock response that throws JSON exception
-    mock_connection = mock_credentials.create_connection.return_value
-    mock_response = Mock()
-    mock_response.status_code = 400
-    mock_response.json.side_effect = Exception("Invalid JSON")
-    mock_connection.post.return_value = mock_response
-
-    result = client.send_notification(token, payload, TOPIC)
-    assert result == "InternalException"
-
-
-def test_notification_priority_and_type_inference() -> None:
     """Test that push types are correctly inferred from topic and payload."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
+    token = _DEVICE_TOKEN
 
     # Test VoIP inference
-    payload = Payload(alert="Test")
+    payload = _TEST_PAYLOAD
     client.send_notification(token, payload, "com.example.app.voip")
 
     # Check that the call was made with VoIP push type
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert headers.get("apns-push-type") == "voip"
 
 
-def test_notification_with_custom_priority() -> None:
+def test_notification_with_custom_priority(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test sending notification with custom priority."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
     # Test with delayed priority
-    client.send_notification(
-        token, payload, TOPIC, priority=NotificationPriority.Delayed
-    )
+    client.send_notification(token, payload, TOPIC, priority=_PRI_DELAYED)
 
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert headers.get("apns-priority") == "5"
 
 
-def test_notification_with_collapse_id_and_expiration() -> None:
+def test_notification_with_collapse_id_and_expiration(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test notification with collapse ID and expiration."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
     client.send_notification(
         token,
@@ -345,15 +412,10 @@ def test_notification_with_collapse_id_and_expiration() -> None:
         TOPIC,
         collapse_id="test-collapse",
         expiration=1234567890,
-        push_type=NotificationType.Alert,
+        push_type=_TYPE_ALERT,
     )
 
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert headers.get("apns-collapse-id") == "test-collapse"
     assert headers.get("apns-expiration") == "1234567890"
     assert headers.get("apns-push-type") == "alert"
@@ -362,157 +424,101 @@ def test_notification_with_collapse_id_and_expiration() -> None:
 def test_certificate_credentials_initialization() -> None:
     """Test client initialization with certificate path."""
     with patch("apns2.client.CertificateCredentials") as mock_cert_creds:
-        mock_cert_instance = Mock()
-        mock_cert_creds.return_value = mock_cert_instance
+        cert_credentials = FakeCredentials()
+        mock_cert_creds.return_value = cert_credentials
 
         client = APNsClient(credentials="fake_cert.pem", password="test_password")
 
         mock_cert_creds.assert_called_once_with("fake_cert.pem", "test_password")
-        # Verify credentials were set (accessing private attribute for testing)
-        assert hasattr(client, "_APNsClient__credentials")
-        assert client._APNsClient__credentials == mock_cert_instance  # type: ignore[attr-defined]
+        assert client.credentials is cert_credentials
 
 
-def test_push_type_inference_background() -> None:
+def test_push_type_inference_background(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test background push type inference."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
+    token = _DEVICE_TOKEN
 
     # Background payload (no alert, badge, or sound)
-    payload = Payload(content_available=True)
+    payload = _BACKGROUND_PAYLOAD
     client.send_notification(token, payload, TOPIC)
 
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert headers.get("apns-push-type") == "background"
 
 
-def test_authorization_header_inclusion() -> None:
+def test_authorization_header_inclusion(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test that authorization header is included when provided by credentials."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = "Bearer test-token"
+    mock_connection = mock_credentials.connection
+    mock_credentials.authorization_header = "Bearer test-token"
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
     client.send_notification(token, payload, TOPIC)
 
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert headers.get("authorization") == "Bearer test-token"
 
 
-def test_multiple_topic_types_inference() -> None:
-    """Test push type inference for different topic suffixes."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
-
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
-
-    # Test different topic suffixes
-    test_cases = [
+@pytest.mark.parametrize(
+    ("topic", "expected_type"),
+    [
         ("com.example.app.complication", "complication"),
         ("com.example.app.pushkit.fileprovider", "fileprovider"),
         ("com.example.app.voip", "voip"),
         ("com.example.app", "alert"),  # regular app with alert
-    ]
+    ],
+)
+def test_multiple_topic_types_inference(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    topic: str,
+    expected_type: str,
+) -> None:
+    """Test push type inference for different topic suffixes."""
+    mock_connection = mock_credentials.connection
 
-    for topic, expected_type in test_cases:
-        mock_connection.reset_mock()
-        client.send_notification(token, payload, topic)
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
-        call_args = mock_connection.post.call_args
-        headers = (
-            call_args[1]["headers"]
-            if "headers" in call_args[1]
-            else call_args.kwargs["headers"]
-        )
-        assert headers.get("apns-push-type") == expected_type, (
-            f"Failed for topic {topic}"
-        )
+    client.send_notification(token, payload, topic)
+
+    headers = _headers(mock_connection)
+    assert headers.get("apns-push-type") == expected_type
 
 
 def test_json_encoder_usage() -> None:
     """Test that custom JSON encoder is used when provided."""
-    import json
+    encoded: list[Any] = []
 
-    class CustomEncoder(json.JSONEncoder):
+    class RecordingEncoder(json.JSONEncoder):
         def encode(self, obj: Any) -> str:
-            return super().encode({"custom": True, **obj})
+            encoded.append(obj)
+            return '{"custom":true}'
 
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    client, mock_connection = _make_client(json_encoder=RecordingEncoder)
 
-    client = APNsClient(credentials=credentials, json_encoder=CustomEncoder)
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    client.send_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC)
 
-    client.send_notification(token, payload, TOPIC)
-
-    # Verify the custom encoder was used
-    call_args = mock_connection.post.call_args
-    sent_data = (
-        call_args[1]["content"]
-        if "content" in call_args[1]
-        else call_args.kwargs["content"]
-    )
-    parsed_data = json.loads(sent_data.decode())
-    assert "custom" in parsed_data
+    # The encoder saw the payload and its output was sent as is
+    assert encoded == [_TEST_PAYLOAD.dict()]
+    assert mock_connection.post.call_args.kwargs["content"] == b'{"custom":true}'
 
 
 @pytest.mark.asyncio
-async def test_async_send_notification_direct() -> None:
+async def test_async_send_notification_direct(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test async notification sending directly."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test message")
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
     result = await client.asend_notification(token, payload, TOPIC)
     assert result == "Success"
@@ -520,23 +526,19 @@ async def test_async_send_notification_direct() -> None:
 
 
 @pytest.mark.asyncio
-async def test_async_batch_with_exception_handling() -> None:
+async def test_async_batch_with_exception_handling(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test async batch handling when some requests fail with exceptions."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
     notifications = [
-        Notification(token="1" * 64, payload=Payload(alert="Test 1")),
-        Notification(token="2" * 64, payload=Payload(alert="Test 2")),
+        Notification(token=_DEVICE_TOKEN, payload=Payload(alert="Test 1")),
+        Notification(token=_OTHER_DEVICE_TOKEN, payload=Payload(alert="Test 2")),
     ]
 
     # Mock one success and one exception
-    mock_success_response = Mock()
-    mock_success_response.status_code = 200
-    mock_success_response.json.return_value = {}
+    mock_success_response = _resp(200, _SUCCESS_BODY)
 
     mock_connection.post.side_effect = [
         mock_success_response,
@@ -545,45 +547,39 @@ async def test_async_batch_with_exception_handling() -> None:
 
     results = await client.asend_notification_batch(notifications, TOPIC)
 
-    assert results["1" * 64] == "Success"
-    assert results["2" * 64] == "InternalException"
+    assert results[_DEVICE_TOKEN] == "Success"
+    assert results[_OTHER_DEVICE_TOKEN] == "InternalException"
 
 
-def test_payload_size_limits() -> None:
-    """Test notification with very large payload."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 413  # Payload Too Large
-    mock_response.json.return_value = {"reason": "PayloadTooLarge"}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
-
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-
-    # Create a very large payload
-    large_custom_data = {"large_data": "x" * 5000}  # > 4KB
-    payload = Payload(alert="Test", custom=large_custom_data)
-
-    result = client.send_notification(token, payload, TOPIC)
-    assert result == "PayloadTooLarge"
+@pytest.mark.asyncio
+async def test_async_batch_unserializable_payload_fails_only_its_tokens(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
+    """Test that a payload that can't be encoded doesn't abort the whole batch."""
+    bad_payload = Payload(alert="Test", custom={"x": object()})
+    notifications = [
+        Notification(token=_DEVICE_TOKEN, payload=_TEST_PAYLOAD),
+        Notification(token=_OTHER_DEVICE_TOKEN, payload=bad_payload),
+        Notification(token="3" * 64, payload=bad_payload),
+    ]
 
+    results = await client.asend_notification_batch(notifications, TOPIC)
 
-def test_various_http_error_codes() -> None:
-    """Test handling of various HTTP error codes from APNs."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    assert results == {
+        _DEVICE_TOKEN: "Success",
+        _OTHER_DEVICE_TOKEN: "InternalException",
+        "3" * 64: "InternalException",
+    }
+    # Nothing is sent for the payload that failed to encode
+    assert [
+        _token_from(call.args[0])
+        for call in mock_credentials.connection.post.call_args_list
+    ] == [_DEVICE_TOKEN]
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
 
-    # Test different error scenarios
-    error_cases = [
+@pytest.mark.parametrize(
+    ("status_code", "json_response", "expected_result"),
+    [
         (400, {"reason": "BadDeviceToken"}, "BadDeviceToken"),
         (403, {"reason": "Forbidden"}, "Forbidden"),
         (404, {"reason": "BadPath"}, "BadPath"),
@@ -592,80 +588,481 @@ def test_various_http_error_codes() -> None:
         (429, {"reason": "TooManyRequests"}, "TooManyRequests"),
         (500, {"reason": "InternalServerError"}, "InternalServerError"),
         (503, {"reason": "ServiceUnavailable"}, "ServiceUnavailable"),
-    ]
-
-    for status_code, json_response, expected_result in error_cases:
-        mock_response = Mock()
-        mock_response.status_code = status_code
-        mock_response.json.return_value = json_response
-        mock_connection.post.return_value = mock_response
+    ],
+)
+def test_various_http_error_codes(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    status_code: int,
+    json_response: dict[str, str],
+    expected_result: str,
+) -> None:
+    """Test handling of various HTTP error codes from APNs."""
+    mock_credentials.respond(status_code, json_response)
 
-        result = client.send_notification(token, payload, TOPIC)
-        assert result == expected_result, f"Failed for status code {status_code}"
+    result = client.send_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC)
+    assert result == expected_result
 
 
-def test_missing_topic_handling() -> None:
+def test_missing_topic_handling(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
     """Test notification sending without topic."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
+    mock_connection = mock_credentials.connection
 
-    client = APNsClient(credentials=credentials)
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    token = _DEVICE_TOKEN
+    payload = _TEST_PAYLOAD
 
     # Send without topic (None)
     client.send_notification(token, payload, None)
 
-    call_args = mock_connection.post.call_args
-    headers = (
-        call_args[1]["headers"]
-        if "headers" in call_args[1]
-        else call_args.kwargs["headers"]
-    )
+    headers = _headers(mock_connection)
     assert "apns-topic" not in headers
 
 
-def test_notification_url_construction() -> None:
+@pytest.mark.parametrize(
+    ("use_sandbox", "use_alternative_port", "server", "port"),
+    [
+        pytest.param(
+            False, False, APNsClient.LIVE_SERVER, APNsClient.DEFAULT_PORT, id="live"
+        ),
+        pytest.param(
+            True,
+            True,
+            APNsClient.SANDBOX_SERVER,
+            APNsClient.ALTERNATIVE_PORT,
+            id="sandbox-alternative-port",
+        ),
+    ],
+)
+def test_notification_url_construction(
+    use_sandbox: bool, use_alternative_port: bool, server: str, port: int
+) -> None:
     """Test that notification URLs are constructed correctly."""
-    credentials = Mock(spec=Credentials)
-    mock_connection = AsyncMock()
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {}
-    mock_connection.post.return_value = mock_response
-    credentials.create_connection.return_value = mock_connection
-    credentials.get_authorization_header.return_value = None
-
-    # Test with different configurations
-    client_prod = APNsClient(credentials=credentials, use_sandbox=False)
-    client_sandbox = APNsClient(
-        credentials=credentials, use_sandbox=True, use_alternative_port=True
+    client, connection = _make_client(
+        use_sandbox=use_sandbox, use_alternative_port=use_alternative_port
     )
 
-    token = "1" * 64
-    payload = Payload(alert="Test")
+    client.send_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC)
+    assert f"https://{server}:{port}/3/device/{_DEVICE_TOKEN}" in _url(connection)
+
+
+@pytest.mark.asyncio
+async def test_async_batch_serializes_shared_payload_once(
+    client: APNsClient, mock_credentials: FakeCredentials, tokens: list[str]
+) -> None:
+    """Test that a payload shared across a batch is only serialized once."""
+    payload = Payload(alert="Broadcast")
+    notifications = [Notification(token=token, payload=payload) for token in tokens]
+
+    with patch.object(Payload, "dict", autospec=True, return_value={"aps": {}}) as m:
+        results = await client.asend_notification_batch(notifications, TOPIC)
+
+    assert m.call_count == 1
+    assert results == dict.fromkeys(tokens, "Success")
+
+    mock_connection = mock_credentials.connection
+    sent_bodies = {
+        call.kwargs["content"] for call in mock_connection.post.call_args_list
+    }
+    assert sent_bodies == {b'{"aps":{}}'}
+
+
+@pytest.mark.asyncio
+async def test_async_batch_sends_preserialized_payloads_as_is(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    notifications: list[Notification],
+    payload_bytes: bytes,
+) -> None:
+    """Test that bytes payloads are neither re-encoded nor parsed per token."""
+    with patch("apns2.client.orjson.loads", wraps=orjson.loads) as loads:
+        await client.asend_notification_batch(notifications, TOPIC)
+
+    mock_connection = mock_credentials.connection
+    for call in mock_connection.post.call_args_list:
+        assert call.kwargs["content"] is payload_bytes
+        assert call.kwargs["headers"]["apns-push-type"] == "alert"
+    # Push type inference reads the shared bytes once, responses parse nothing
+    assert loads.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param(b"notjson", id="not-json"),
+        pytest.param(b"[1]", id="not-an-object"),
+        pytest.param(b'{"aps": 1}', id="aps-not-an-object"),
+    ],
+)
+def test_opaque_bytes_payload_sent_with_default_push_type(
+    client: APNsClient, mock_credentials: FakeCredentials, payload: bytes
+) -> None:
+    """Test that bytes push type inference can't parse are still sent as is."""
+    assert client.send_notification(_DEVICE_TOKEN, payload, TOPIC) == "Success"
+
+    call = mock_credentials.connection.post.call_args
+    assert call.kwargs["content"] is payload
+    assert call.kwargs["headers"]["apns-push-type"] == "alert"
+
 
-    # Test production URL
-    client_prod.send_notification(token, payload, TOPIC)
-    call_args = mock_connection.post.call_args
-    url = call_args[0][0] if len(call_args[0]) > 0 else call_args.args[0]
+@pytest.mark.asyncio
+async def test_async_batch_shares_headers_and_infers_push_type(
+    mock_credentials: FakeCredentials,
+) -> None:
+    """Test that batch headers are built once while push type follows each payload."""
+    mock_credentials.authorization_header = "bearer test-token"
+    client = APNsClient(credentials=mock_credentials)
+    notifications = [
+        Notification(token=_DEVICE_TOKEN, payload=_TEST_PAYLOAD),
+        Notification(token=_OTHER_DEVICE_TOKEN, payload=_BACKGROUND_PAYLOAD),
+    ]
+
+    await client.asend_notification_batch(notifications, TOPIC)
+
+    assert mock_credentials.authorization_topics == [TOPIC]
+    mock_connection = mock_credentials.connection
+    push_types = {
+        _token_from(call.args[0]): call.kwargs["headers"]["apns-push-type"]
+        for call in mock_connection.post.call_args_list
+    }
+    assert push_types == {_DEVICE_TOKEN: "alert", _OTHER_DEVICE_TOKEN: "background"}
+    for call in mock_connection.post.call_args_list:
+        assert call.kwargs["headers"]["authorization"] == "bearer test-token"
+
+
+@pytest.mark.asyncio
+async def test_sync_send_from_async_context_reuses_background_loop(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
+    """Test that sync calls made from a running loop share one background loop."""
+    mock_connection = mock_credentials.connection
+    success_response = mock_credentials.response
+    loops: list[asyncio.AbstractEventLoop] = []
+
+    async def record_loop(url: str, **kwargs: Any) -> FakeResponse:
+        loops.append(asyncio.get_running_loop())
+        return success_response
+
+    mock_connection.post.side_effect = record_loop
+
+    assert client.send_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC) == "Success"
     assert (
-        f"https://{APNsClient.LIVE_SERVER}:{APNsClient.DEFAULT_PORT}/3/device/{token}"
-        in url
+        client.send_notification(_OTHER_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC) == "Success"
     )
 
-    # Reset mock and test sandbox URL
-    mock_connection.reset_mock()
-    client_sandbox.send_notification(token, payload, TOPIC)
-    call_args = mock_connection.post.call_args
-    url = call_args[0][0] if len(call_args[0]) > 0 else call_args.args[0]
-    assert (
-        f"https://{APNsClient.SANDBOX_SERVER}:{APNsClient.ALTERNATIVE_PORT}/3/device/{token}"
-        in url
+    assert len(loops) == 2
+    assert loops[0] is loops[1]
+    assert loops[0] is not asyncio.get_running_loop()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+@pytest.mark.filterwarnings("ignore:.*fork:DeprecationWarning")
+def test_background_loop_is_replaced_in_forked_child() -> None:
+    """Test that a forked child runs sync calls on a loop of its own."""
+    parent_loop = _BackgroundLoop.get()
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            loop = _BackgroundLoop.get()
+            future = asyncio.run_coroutine_threadsafe(asyncio.sleep(0, "ok"), loop)
+            if loop is not parent_loop and future.result(timeout=5) == "ok":
+                exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_batch_respects_max_concurrent_streams(
+    mock_credentials: FakeCredentials, notifications: list[Notification]
+) -> None:
+    """Test that no more than max_concurrent_streams requests are in flight."""
+    client = APNsClient(credentials=mock_credentials, max_concurrent_streams=2)
+    mock_connection = mock_credentials.connection
+    success_response = mock_credentials.response
+    in_flight = 0
+    peak = 0
+
+    async def slow_post(url: str, **kwargs: Any) -> FakeResponse:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return success_response
+
+    mock_connection.post.side_effect = slow_post
+
+    results = await client.asend_notification_batch(notifications, TOPIC)
+
+    assert len(results) == len(notifications)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_async_batch_stream_limit_shared_by_clients_on_one_connection(
+    mock_credentials: FakeCredentials, notifications: list[Notification]
+) -> None:
+    """Test that clients on one pooled connection share its stream limit."""
+    clients = [
+        APNsClient(credentials=mock_credentials, max_concurrent_streams=2)
+        for _ in range(2)
+    ]
+    mock_connection = mock_credentials.connection
+    success_response = mock_credentials.response
+    in_flight = 0
+    peak = 0
+
+    async def slow_post(url: str, **kwargs: Any) -> FakeResponse:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return success_response
+
+    mock_connection.post.side_effect = slow_post
+
+    await asyncio.gather(
+        *(client.asend_notification_batch(notifications, TOPIC) for client in clients)
+    )
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_async_batch_streams_resolve_independently(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    tokens: list[str],
+    notifications: list[Notification],
+) -> None:
+    """Test that streams are open at once and may complete in any order."""
+    loop = asyncio.get_running_loop()
+    streams: dict[str, asyncio.Future[FakeResponse]] = {
+        token: loop.create_future() for token in tokens
+    }
+    mock_connection = mock_credentials.connection
+
+    async def post(url: str, **kwargs: Any) -> FakeResponse:
+        return await streams[_token_from(url)]
+
+    mock_connection.post.side_effect = post
+    batch = asyncio.create_task(client.asend_notification_batch(notifications, TOPIC))
+
+    # Every stream the concurrency limit allows opens before any completes
+    open_streams = min(len(tokens), APNsClient.DEFAULT_MAX_CONCURRENT_STREAMS)
+    for _ in range(100):
+        if mock_connection.post.await_count == open_streams:
+            break
+        await asyncio.sleep(0)
+    assert mock_connection.post.await_count == open_streams
+    assert not batch.done()
+
+    # Complete the streams in reverse order, alternating success and failure
+    for i, token in reversed(list(enumerate(tokens))):
+        response = _resp(200, _SUCCESS_BODY) if i % 2 else _resp(400, _BAD_TOKEN_BODY)
+        streams[token].set_result(response)
+
+    assert await batch == {
+        token: "Success" if i % 2 else "BadDeviceToken"
+        for i, token in enumerate(tokens)
+    }
+
+
+@pytest.mark.asyncio
+async def test_large_batch_shares_one_connection(
+    token_pool: tuple[str, ...], payload_bytes: bytes
+) -> None:
+    """Test that a 1000 notification batch is sent without reconnecting."""
+    credentials = FakeCredentials()
+    client = APNsClient(credentials=credentials)
+    notifications = [
+        Notification(token=token, payload=payload_bytes) for token in token_pool[:1000]
+    ]
+
+    results = await client.asend_notification_batch(notifications, TOPIC)
+
+    assert len(results) == 1000
+    assert credentials.connection.post.call_count == 1000
+    assert credentials.connections_created == 1
+
+
+def test_sync_calls_look_up_connection_per_event_loop() -> None:
+    """Test that sync calls don't reuse a pool opened on an earlier, closed loop."""
+    credentials = FakeCredentials()
+    client = APNsClient(credentials=credentials)
+
+    for _ in range(2):
+        assert (
+            client.send_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC) == "Success"
+        )
+
+    assert credentials.connections_created == 2
+    assert credentials.connection.post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_batch_accepts_streaming_inputs(
+    client: APNsClient,
+    mock_credentials: FakeCredentials,
+    tokens: list[str],
+    notifications: list[Notification],
+) -> None:
+    """Test that generators and async generators are consumed without a list."""
+    mock_connection = mock_credentials.connection
+
+    async def agen() -> AsyncIterator[Notification]:
+        for notification in notifications:
+            yield notification
+
+    results = await client.asend_notification_batch((n for n in notifications), TOPIC)
+    assert results == dict.fromkeys(tokens, "Success")
+
+    results = await client.asend_notification_batch(agen(), TOPIC)
+    assert results == dict.fromkeys(tokens, "Success")
+    assert mock_connection.post.call_count == 2 * len(notifications)
+
+
+@pytest.mark.asyncio
+async def test_async_batch_response_errors_stay_per_token(
+    mock_credentials: FakeCredentials,
+) -> None:
+    """Test that a response that fails to process doesn't stall the batch."""
+    # A single worker and queue slot, so a dead worker would block the producer
+    client = APNsClient(credentials=mock_credentials, max_concurrent_streams=1)
+    bad_token = _OTHER_DEVICE_TOKEN
+    mock_credentials.connection.post.side_effect = lambda url, **kwargs: (
+        _resp(418, _SUCCESS_BODY) if _token_from(url) == bad_token else _resp(200, b"")
+    )
+    notifications = [
+        Notification(token=token, payload=_TEST_PAYLOAD)
+        for token in (_DEVICE_TOKEN, bad_token, "3" * 64, "4" * 64)
+    ]
+
+    def process(response: FakeResponse) -> str:
+        if response.status_code == 418:
+            raise RuntimeError("Unexpected response")
+        return "Success"
+
+    with patch.object(APNsClient, "_process_response", side_effect=process):
+        results = await asyncio.wait_for(
+            client.asend_notification_batch(notifications, TOPIC), timeout=5
+        )
+
+    assert results == {
+        _DEVICE_TOKEN: "Success",
+        bad_token: "InternalException",
+        "3" * 64: "Success",
+        "4" * 64: "Success",
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_batch_input_error_lets_started_streams_finish(
+    client: APNsClient, mock_credentials: FakeCredentials
+) -> None:
+    """Test that a failing input doesn't cancel streams already started."""
+    finished: list[str] = []
+
+    async def slow_post(url: str, **kwargs: Any) -> FakeResponse:
+        await asyncio.sleep(0)
+        finished.append(_token_from(url))
+        return _resp(200, _SUCCESS_BODY)
+
+    mock_credentials.connection.post.side_effect = slow_post
+
+    async def agen() -> AsyncIterator[Notification]:
+        yield Notification(token=_DEVICE_TOKEN, payload=_TEST_PAYLOAD)
+        yield Notification(token=_OTHER_DEVICE_TOKEN, payload=_TEST_PAYLOAD)
+        raise ValueError("Broken input")
+
+    with pytest.raises(ValueError, match="Broken input"):
+        await client.asend_notification_batch(agen(), TOPIC)
+
+    assert sorted(finished) == [_DEVICE_TOKEN, _OTHER_DEVICE_TOKEN]
+
+
+@pytest.mark.asyncio
+async def test_async_send_retries_with_exponential_backoff(
+    mock_credentials: FakeCredentials, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that throttled and failed requests are retried after growing delays."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    client = APNsClient(credentials=mock_credentials, max_retries=3)
+    mock_connection = mock_credentials.connection
+    mock_connection.post.side_effect = [
+        _resp(429, {"reason": "TooManyRequests"}),
+        _resp(503, {"reason": "ServiceUnavailable"}),
+        _resp(429, {"reason": "TooManyRequests"}),
+        _resp(200, _SUCCESS_BODY),
+    ]
+
+    result = await client.asend_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC)
+
+    assert result == "Success"
+    assert mock_connection.post.call_count == 4
+    assert [call.args[0] for call in sleep.await_args_list] == [0.5, 1.0, 2.0]
+
+    # Once the retries are used up the last response is returned
+    mock_connection.post.side_effect = None
+    mock_credentials.respond(429, {"reason": "TooManyRequests"})
+
+    result = await client.asend_notification(_DEVICE_TOKEN, _TEST_PAYLOAD, TOPIC)
+
+    assert result == "TooManyRequests"
+    assert mock_connection.post.call_count == 4 + 4
+    assert [call.args[0] for call in sleep.await_args_list[3:]] == [0.5, 1.0, 2.0]
+
+
+def test_sync_timeout_leaves_room_for_retry_backoff() -> None:
+    """Test that sync calls aren't timed out while their retries back off."""
+    client, _ = _make_client(max_retries=12)
+
+    # Later delays are capped at RETRY_BACKOFF_MAX
+    backoff = sum(client._retry_delay(attempt) for attempt in range(1, 13))
+    assert client._retry_delay(12) == APNsClient.RETRY_BACKOFF_MAX
+    assert client._sync_timeout() == APNsClient.SYNC_TIMEOUT + backoff
+    assert _make_client()[0]._sync_timeout() == APNsClient.SYNC_TIMEOUT
+
+
+def test_process_response_fallback_reasons(client: APNsClient) -> None:
+    """Test the fallback results for error bodies without a usable reason."""
+    response = _resp(410, {"timestamp": 1234567890})
+    assert client._process_response(cast(Response, response)) == (
+        "Unregistered",
+        "1234567890",
+    )
+
+    response = _resp(400, ["not", "an", "object"])
+    assert client._process_response(cast(Response, response)) == "InternalException"
+
+
+def test_process_response_interns_reasons(client: APNsClient) -> None:
+    """Test that repeated reasons from separate responses share one string."""
+    first = client._process_response(
+        cast(Response, _resp(400, {"reason": "BadDeviceToken"}))
+    )
+    second = client._process_response(
+        cast(Response, _resp(400, {"reason": "BadDeviceToken"}))
+    )
+    assert first == "BadDeviceToken"
+    assert first is second
+
+
+def test_push_type_for_topic_rules() -> None:
+    """Test the push types implied by topic suffixes."""
+    assert _push_type_for_topic("com.example.app.voip") == "voip"
+    assert _push_type_for_topic("com.example.app.complication") == "complication"
+    assert _push_type_for_topic("com.example.app.pushkit.fileprovider") == (
+        "fileprovider"
     )
+    assert _push_type_for_topic("com.example.app") is None
+    # Only a dot-separated suffix counts
+    assert _push_type_for_topic("voip") is None
@@ -1,13 +1,50 @@
+import asyncio
 import ssl
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from typing import Callable
+from unittest.mock import Mock, call, patch
 
+import httpx
+import jwt
 import pytest
-from freezegun import freeze_time
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 
-from apns2.credentials import CertificateCredentials, Credentials, TokenCredentials
+from apns2.credentials import (
+    _CLIENT_CACHE,
+    _CLIENT_CACHE_SIZE,
+    CertificateCredentials,
+    Credentials,
+    TokenCredentials,
+)
+
+# Under pytest -n these share a worker, so the parsed signing key is reused
+pytestmark = pytest.mark.xdist_group("credentials")
 
 TOPIC: str = "com.example.first_app"
 
+# 2012-01-14 12:00:00 UTC
+_EPOCH = 1326542400.0
+
+
+@pytest.fixture(scope="session")
+def eckey_pem() -> bytes:
+    with open("test/eckey.pem", "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def set_clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Pin the clocks apns2.credentials reads to ``seconds`` after a fixed epoch."""
+    clock = SimpleNamespace(time=lambda: _EPOCH, monotonic=lambda: _EPOCH)
+    # Only the credentials module sees the fake, unlike freezegun's global patching
+    monkeypatch.setattr("apns2.credentials.time", clock)
+
+    def move_to(seconds: float) -> None:
+        clock.time = clock.monotonic = lambda: _EPOCH + seconds
+
+    return move_to
+
 
 @pytest.fixture
 def token_credentials() -> TokenCredentials:
@@ -19,22 +56,24 @@ def token_credentials() -> TokenCredentials:
     )
 
 
-def test_token_expiration_and_reuse(token_credentials: TokenCredentials) -> None:
+def test_token_expiration_and_reuse(
+    token_credentials: TokenCredentials, set_clock: Callable[[float], None]
+) -> None:
     """Test that tokens are reused when not expired and regenerated when expired."""
-    with freeze_time("2012-01-14 12:00:00"):
-        header1 = token_credentials.get_authorization_header(TOPIC)
-        assert header1.startswith("bearer ")
+    set_clock(0)
+    header1 = token_credentials.get_authorization_header(TOPIC)
+    assert header1.startswith("bearer ")
 
     # 20 seconds later, before expiration, same JWT
-    with freeze_time("2012-01-14 12:00:20"):
-        header2 = token_credentials.get_authorization_header(TOPIC)
-        assert header1 == header2
+    set_clock(20)
+    header2 = token_credentials.get_authorization_header(TOPIC)
+    assert header1 == header2
 
-    # 35 seconds later, after expiration, new JWT
-    with freeze_time("2012-01-14 12:00:40"):
-        header3 = token_credentials.get_authorization_header(TOPIC)
-        assert header3 != header1
-        assert header3.startswith("bearer ")
+    # 40 seconds later, after expiration, new JWT
+    set_clock(40)
+    header3 = token_credentials.get_authorization_header(TOPIC)
+    assert header3 != header1
+    assert header3.startswith("bearer ")
 
 
 def test_token_credentials_initialization() -> None:
@@ -52,8 +91,6 @@ def test_token_credentials_initialization() -> None:
     assert header.startswith("bearer ")
 
     # Test that the token contains expected claims by decoding header
-    import jwt
-
     token = header.split(" ")[1]
     # We can't verify signature without the actual key, but we can decode without verification
     payload = jwt.decode(token, options={"verify_signature": False})
@@ -96,9 +133,10 @@ def test_certificate_credentials_initialization(mock_ssl_context: Mock) -> None:
     mock_context.load_cert_chain.assert_called_once_with("test.pem", password=None)
 
     # Test with cert file and password
-    mock_context.reset_mock()
     CertificateCredentials(cert_file="test.pem", password="secret")
-    mock_context.load_cert_chain.assert_called_with("test.pem", password="secret")
+    assert mock_context.load_cert_chain.call_args_list[1] == call(
+        "test.pem", password="secret"
+    )
 
 
 @patch("apns2.credentials.ssl.create_default_context")
@@ -114,15 +152,11 @@ def test_certificate_credentials_with_cert_chain(mock_ssl_context: Mock) -> None
     assert mock_context.load_cert_chain.call_count == 2
 
 
-def test_token_credentials_authorization_header_format() -> None:
+def test_token_credentials_authorization_header_format(
+    token_credentials: TokenCredentials,
+) -> None:
     """Test that authorization header has correct format."""
-    creds = TokenCredentials(
-        auth_key_path="test/eckey.pem",
-        auth_key_id="TEST123",
-        team_id="TEAM456",
-    )
-
-    header = creds.get_authorization_header(TOPIC)
+    header = token_credentials.get_authorization_header(TOPIC)
 
     # Should start with "bearer " (lowercase)
     assert header.startswith("bearer ")
@@ -133,21 +167,43 @@ def test_token_credentials_authorization_header_format() -> None:
     assert len(parts) == 3  # header.payload.signature
 
 
-def test_token_credentials_multiple_calls_same_topic() -> None:
+def test_token_credentials_multiple_calls_same_topic(
+    token_credentials: TokenCredentials,
+) -> None:
     """Test multiple calls for the same topic reuse token when not expired."""
+    # Multiple calls should return the same token
+    header1 = token_credentials.get_authorization_header(TOPIC)
+    header2 = token_credentials.get_authorization_header(TOPIC)
+    header3 = token_credentials.get_authorization_header(TOPIC)
+
+    assert header1 == header2 == header3
+
+
+@pytest.mark.parametrize(
+    "algorithm,signer",
+    [
+        ("ES256", "apns2.credentials.TokenCredentials._encode_es256"),
+        ("ES384", "apns2.credentials.jwt.encode"),
+    ],
+)
+def test_token_credentials_signs_once_per_lifetime(
+    algorithm: str, signer: str, set_clock: Callable[[float], None]
+) -> None:
+    """Test that repeated headers within the token lifetime sign a single JWT."""
     creds = TokenCredentials(
         auth_key_path="test/eckey.pem",
         auth_key_id="TEST123",
         team_id="TEAM456",
-        token_lifetime=60,
+        encryption_algorithm=algorithm,
+        token_lifetime=30,
     )
 
-    # Multiple calls should return the same token
-    header1 = creds.get_authorization_header(TOPIC)
-    header2 = creds.get_authorization_header(TOPIC)
-    header3 = creds.get_authorization_header(TOPIC)
+    set_clock(0)
+    with patch(signer, return_value="signed") as sign:
+        headers = {creds.get_authorization_header(TOPIC) for _ in range(3)}
 
-    assert header1 == header2 == header3
+    assert headers == {"bearer signed"}
+    assert sign.call_count == 1
 
 
 @patch("builtins.open", side_effect=FileNotFoundError("No such file"))
@@ -176,3 +232,91 @@ def test_credentials_connection_configuration() -> None:
 
     # Connections should be different instances
     assert connection1 is not connection2
+
+
+async def test_credentials_connection_is_shared() -> None:
+    """Test that connections with the same settings reuse one pooled client."""
+    ssl_context = ssl.create_default_context()
+    credentials1 = Credentials(ssl_context=ssl_context)
+    credentials2 = Credentials(ssl_context=ssl_context)
+
+    connection1 = credentials1.create_connection("api.push.apple.com", 443, None)
+    connection2 = credentials2.create_connection("api.push.apple.com", 443, None)
+    assert connection1 is connection2
+
+    # A different SSL context must never share a pool
+    other = Credentials(ssl_context=ssl.create_default_context())
+    assert other.create_connection("api.push.apple.com", 443, None) is not connection1
+
+
+def test_credentials_connection_is_scoped_to_event_loop() -> None:
+    """Test that each event loop gets its own pool, as connections can't move."""
+    credentials = Credentials()
+
+    async def connect() -> httpx.AsyncClient:
+        return credentials.create_connection("api.push.apple.com", 443, None)
+
+    assert asyncio.run(connect()) is not asyncio.run(connect())
+    # Outside a loop the pool is never shared
+    assert credentials.create_connection(
+        "api.push.apple.com", 443, None
+    ) is not credentials.create_connection("api.push.apple.com", 443, None)
+
+
+@patch("apns2.credentials.ssl.create_default_context")
+async def test_certificate_credentials_share_connection_by_certificate(
+    mock_ssl_context: Mock,
+) -> None:
+    """Test that certificate credentials share pools by file, not SSL context."""
+    mock_ssl_context.side_effect = lambda: Mock()
+
+    def connect(cert_file: str) -> httpx.AsyncClient:
+        credentials = CertificateCredentials(cert_file=cert_file)
+        return credentials.create_connection("api.push.apple.com", 443, None)
+
+    assert connect("test.pem") is connect("test.pem")
+    assert connect("test.pem") is not connect("other.pem")
+
+
+async def test_credentials_connection_cache_is_bounded() -> None:
+    """Test that a loop keeps only its most recently used pools."""
+    ssl_context = ssl.create_default_context()
+    credentials = Credentials(ssl_context=ssl_context)
+    first = credentials.create_connection("api.push.apple.com", 443, None)
+
+    for port in range(_CLIENT_CACHE_SIZE):
+        Credentials().create_connection("api.push.apple.com", port, None)
+
+    assert len(_CLIENT_CACHE[asyncio.get_running_loop()]) == _CLIENT_CACHE_SIZE
+    assert credentials.create_connection("api.push.apple.com", 443, None) is not first
+
+
+def test_token_credentials_es256_token_verifies(eckey_pem: bytes) -> None:
+    """Test that directly signed ES256 tokens verify against the key."""
+    creds = TokenCredentials(
+        auth_key_path="test/eckey.pem",
+        auth_key_id="TEST123",
+        team_id="TEAM456",
+    )
+    token = creds.get_authorization_header(TOPIC).split(" ")[1]
+
+    private_key = serialization.load_pem_private_key(eckey_pem, None)
+    assert isinstance(private_key, ec.EllipticCurvePrivateKey)
+    public_key = private_key.public_key()
+
+    payload = jwt.decode(token, public_key, algorithms=["ES256"])
+    assert payload["iss"] == "TEAM456"
+    assert jwt.get_unverified_header(token) == {
+        "alg": "ES256",
+        "typ": "JWT",
+        "kid": "TEST123",
+    }
+
+
+def test_token_credentials_parse_shared_key_once(eckey_pem: bytes) -> None:
+    """Test that the ES256 signing key is parsed once per PEM contents."""
+    pem = eckey_pem.decode()
+    assert TokenCredentials._load_es256_key(pem) is not None
+    assert TokenCredentials._load_es256_key(pem) is TokenCredentials._load_es256_key(
+        pem
+    )
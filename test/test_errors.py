@@ -2,17 +2,79 @@ import pytest
 
 from apns2.errors import (
     APNsException,
+    BadCollapseId,
     BadDeviceToken,
+    BadExpirationDate,
+    BadMessageId,
     BadPayloadException,
+    BadPriority,
     BadTopic,
     ConnectionFailed,
+    DuplicateHeaders,
+    EXCEPTION_CLASS_MAP,
     exception_class_for_reason,
     InternalException,
+    InternalServerError,
+    MethodNotAllowed,
+    MissingTopic,
+    PayloadEmpty,
     PayloadTooLarge,
+    ServiceUnavailable,
+    Shutdown,
+    TooManyRequests,
+    TopicDisallowed,
     Unregistered,
 )
 
 
+# Common APNs error reasons that should be supported
+KNOWN_REASONS: frozenset[str] = frozenset({
+    "BadCollapseId",
+    "BadDeviceToken",
+    "BadExpirationDate",
+    "BadMessageId",
+    "BadPriority",
+    "BadTopic",
+    "DeviceTokenNotForTopic",
+    "DuplicateHeaders",
+    "IdleTimeout",
+    "MissingDeviceToken",
+    "MissingTopic",
+    "PayloadEmpty",
+    "TopicDisallowed",
+    "BadCertificate",
+    "BadCertificateEnvironment",
+    "ExpiredProviderToken",
+    "Forbidden",
+    "InvalidProviderToken",
+    "MissingProviderToken",
+    "BadPath",
+    "MethodNotAllowed",
+    "Unregistered",
+    "PayloadTooLarge",
+    "TooManyProviderTokenUpdates",
+    "TooManyRequests",
+    "InternalServerError",
+    "ServiceUnavailable",
+    "Shutdown",
+})
+
+
+@pytest.fixture(scope="session")
+def reason_class_map() -> dict[str, type[APNsException]]:
+    # Reasons missing from the mapping are left out, failing only their own case
+    return {
+        reason: EXCEPTION_CLASS_MAP[reason]
+        for reason in KNOWN_REASONS
+        if reason in EXCEPTION_CLASS_MAP
+    }
+
+
+def _class_name(value: object) -> str | None:
+    """Use the class name as the test id for exception class parameters."""
+    return value.__name__ if isinstance(value, type) else None
+
+
 def test_apns_exception_hierarchy() -> None:
     """Test that exception classes have correct inheritance."""
     # Test base exception
@@ -45,79 +107,46 @@ def test_unregistered_exception_with_timestamp() -> None:
 
 def test_exception_class_for_reason_mapping() -> None:
     """Test that exception_class_for_reason returns correct exception classes."""
-    # Test common error reasons
-    test_cases = [
-        ("BadDeviceToken", BadDeviceToken),
-        ("BadTopic", BadTopic),
-        ("PayloadTooLarge", PayloadTooLarge),
-        ("Unregistered", Unregistered),
-    ]
-
-    for reason, expected_class in test_cases:
-        result_class = exception_class_for_reason(reason)
-        assert result_class == expected_class
-
-        # Verify we can instantiate the exception
-        exc_instance = result_class("test message")
-        assert isinstance(exc_instance, expected_class)
-        assert isinstance(exc_instance, APNsException)
+    expected = {
+        "BadDeviceToken": BadDeviceToken,
+        "BadTopic": BadTopic,
+        "PayloadTooLarge": PayloadTooLarge,
+        "Unregistered": Unregistered,
+    }
+    resolved = {reason: exception_class_for_reason(reason) for reason in expected}
+    assert resolved == expected
 
 
 def test_exception_class_for_reason_invalid() -> None:
     """Test exception_class_for_reason with invalid reason."""
-    with pytest.raises(KeyError):
+    with pytest.raises(KeyError, match="InvalidReason"):
         exception_class_for_reason("InvalidReason")
 
 
-def test_all_defined_reasons_have_classes() -> None:
-    """Test that all reasons defined in the mapping have corresponding classes."""
-    # This test ensures that if new reasons are added to the mapping,
-    # their corresponding classes exist and can be instantiated
-
-    # Get all defined reasons from the function's dictionary
-
-    # Common APNs error reasons that should be supported
-    known_reasons = [
-        "BadCollapseId",
-        "BadDeviceToken",
-        "BadExpirationDate",
-        "BadMessageId",
-        "BadPriority",
-        "BadTopic",
-        "DeviceTokenNotForTopic",
-        "DuplicateHeaders",
-        "IdleTimeout",
-        "MissingDeviceToken",
-        "MissingTopic",
-        "PayloadEmpty",
-        "TopicDisallowed",
-        "BadCertificate",
-        "BadCertificateEnvironment",
-        "ExpiredProviderToken",
-        "Forbidden",
-        "InvalidProviderToken",
-        "MissingProviderToken",
-        "BadPath",
-        "MethodNotAllowed",
-        "Unregistered",
-        "PayloadTooLarge",
-        "TooManyProviderTokenUpdates",
-        "TooManyRequests",
-        "InternalServerError",
-        "ServiceUnavailable",
-        "Shutdown",
-    ]
+# Sorted so every xdist worker collects the cases in the same order
+@pytest.mark.parametrize("reason", sorted(KNOWN_REASONS))
+def test_reason_has_class(
+    reason_class_map: dict[str, type[APNsException]], reason: str
+) -> None:
+    """Test that each known reason maps to an exception class."""
+    assert reason in reason_class_map, f"Reason '{reason}' has no exception class"
 
-    for reason in known_reasons:
-        try:
-            exc_class = exception_class_for_reason(reason)
-            # Verify the class can be instantiated
-            instance = exc_class("test")
-            assert isinstance(instance, APNsException)
-        except KeyError:
-            pytest.fail(
-                f"Reason '{reason}' is not defined in exception_class_for_reason"
-            )
+    # Verify the class can be instantiated
+    instance = reason_class_map[reason]("test")
+    assert isinstance(instance, APNsException)
+
+
+def test_exception_class_map_has_only_known_reasons() -> None:
+    """Test that the mapping defines no reason this module doesn't know about."""
+    unknown = EXCEPTION_CLASS_MAP.keys() - KNOWN_REASONS
+    assert not unknown, f"Add these reasons to KNOWN_REASONS: {sorted(unknown)}"
+
+
+def test_exception_class_map_covers_lookup() -> None:
+    """Test that every mapped reason resolves to its APNsException subclass."""
+    for reason, exc_class in EXCEPTION_CLASS_MAP.items():
+        assert issubclass(exc_class, APNsException)
+        assert exception_class_for_reason(reason) is exc_class
 
 
 def test_exception_messages() -> None:
@@ -137,9 +166,9 @@ def test_exception_messages() -> None:
         assert str(exc) == message
 
 
-def test_payload_exceptions_inheritance() -> None:
-    """Test that payload-related exceptions inherit from BadPayloadException."""
-    from apns2.errors import (
+@pytest.mark.parametrize(
+    "exc_class",
+    [
         BadCollapseId,
         BadExpirationDate,
         BadTopic,
@@ -147,64 +176,40 @@ def test_payload_exceptions_inheritance() -> None:
         PayloadEmpty,
         TopicDisallowed,
         PayloadTooLarge,
-    )
-
-    payload_exceptions = [
-        BadCollapseId("test"),
-        BadExpirationDate("test"),
-        BadTopic("test"),
-        MissingTopic("test"),
-        PayloadEmpty("test"),
-        TopicDisallowed("test"),
-        PayloadTooLarge("test"),
-    ]
-
-    for exc in payload_exceptions:
-        assert isinstance(exc, BadPayloadException)
-        assert isinstance(exc, APNsException)
+    ],
+    ids=_class_name,
+)
+def test_payload_exceptions_inheritance(exc_class: type[APNsException]) -> None:
+    """Test that payload-related exceptions inherit from BadPayloadException."""
+    assert issubclass(exc_class, BadPayloadException)
+    assert issubclass(exc_class, APNsException)
 
 
-def test_internal_exceptions_inheritance() -> None:
+@pytest.mark.parametrize(
+    "exc_class",
+    [BadMessageId, BadPriority, DuplicateHeaders, MethodNotAllowed],
+    ids=_class_name,
+)
+def test_internal_exceptions_inheritance(exc_class: type[APNsException]) -> None:
     """Test that internal exceptions inherit from InternalException."""
-    from apns2.errors import (
-        BadMessageId,
-        BadPriority,
-        DuplicateHeaders,
-        MethodNotAllowed,
-    )
-
-    internal_exceptions = [
-        BadMessageId("test"),
-        BadPriority("test"),
-        DuplicateHeaders("test"),
-        MethodNotAllowed("test"),
-    ]
-
-    for exc in internal_exceptions:
-        assert isinstance(exc, InternalException)
-        assert isinstance(exc, APNsException)
+    assert issubclass(exc_class, InternalException)
+    assert issubclass(exc_class, APNsException)
 
 
-def test_connection_and_server_exceptions() -> None:
-    """Test connection and server-related exceptions."""
-    from apns2.errors import (
+@pytest.mark.parametrize(
+    "exc_class",
+    [
         ConnectionFailed,
         InternalServerError,
         ServiceUnavailable,
         Shutdown,
         TooManyRequests,
-    )
-
-    server_exceptions = [
-        ConnectionFailed("Connection failed"),
-        InternalServerError("Server error"),
-        ServiceUnavailable("Service down"),
-        Shutdown("Server shutting down"),
-        TooManyRequests("Rate limited"),
-    ]
-
-    for exc in server_exceptions:
-        assert isinstance(exc, APNsException)
-        # These should not be payload or internal exceptions
-        assert not isinstance(exc, BadPayloadException)
-        assert not isinstance(exc, InternalException)
+    ],
+    ids=_class_name,
+)
+def test_connection_and_server_exceptions(exc_class: type[APNsException]) -> None:
+    """Test connection and server-related exceptions."""
+    assert issubclass(exc_class, APNsException)
+    # These should not be payload or internal exceptions
+    assert not issubclass(exc_class, BadPayloadException)
+    assert not issubclass(exc_class, InternalException)
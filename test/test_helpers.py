@@ -1,6 +1,16 @@
+import sys
+from types import SimpleNamespace
 from unittest.mock import patch
 
-from apns2.helpers import _is_celery_worker, IS_CELERY_WORKER
+import pytest
+
+import apns2.helpers
+from apns2.helpers import (
+    _is_celery_worker,
+    CELERY_ENV_VARS,
+    is_celery_worker,
+    IS_CELERY_WORKER,
+)
 
 
 def test_constant_is_boolean() -> None:
@@ -8,65 +18,65 @@ def test_constant_is_boolean() -> None:
     assert isinstance(IS_CELERY_WORKER, bool)
 
 
-def test_is_celery_worker_with_env_vars() -> None:
+@pytest.mark.parametrize(
+    ("env_var", "value"),
+    [
+        ("CELERY_LOADER", "app.celery"),
+        ("CELERY_WORKER_DIRECT", "1"),
+        ("C_FORCE_ROOT", "1"),
+    ],
+)
+def test_is_celery_worker_with_env_vars(
+    monkeypatch: pytest.MonkeyPatch, env_var: str, value: str
+) -> None:
     """Test Celery detection with environment variables."""
-    # Test with CELERY_LOADER environment variable
-    with patch.dict("os.environ", {"CELERY_LOADER": "app.celery"}):
-        assert _is_celery_worker() is True
-
-    # Test with CELERY_WORKER_DIRECT environment variable
-    with patch.dict("os.environ", {"CELERY_WORKER_DIRECT": "1"}):
-        assert _is_celery_worker() is True
-
-    # Test with C_FORCE_ROOT environment variable
-    with patch.dict("os.environ", {"C_FORCE_ROOT": "1"}):
-        assert _is_celery_worker() is True
-
-
-def test_is_celery_worker_with_argv() -> None:
+    monkeypatch.setenv(env_var, value)
+    assert _is_celery_worker() is True
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        pytest.param(["celery", "worker"], id="argv0"),
+        pytest.param(["python", "-m", "celery", "worker"], id="any-argument"),
+    ],
+)
+def test_is_celery_worker_with_argv(
+    monkeypatch: pytest.MonkeyPatch, argv: list[str]
+) -> None:
     """Test Celery detection with sys.argv."""
-    import sys
+    monkeypatch.setattr(sys, "argv", argv)
+    assert _is_celery_worker() is True
 
-    # Test with celery in argv[0]
-    with patch.object(sys, "argv", ["celery", "worker"]):
-        assert _is_celery_worker() is True
 
-    # Test with celery in any argument
-    with patch.object(sys, "argv", ["python", "-m", "celery", "worker"]):
-        assert _is_celery_worker() is True
-
-
-def test_is_celery_worker_with_current_task() -> None:
+def test_is_celery_worker_with_current_task(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test Celery detection with current_task."""
     # Mock current_task with a request
-    mock_task = type("MockTask", (), {"request": {"id": "task-123"}})()
+    mock_task = SimpleNamespace(request={"id": "task-123"})
 
-    with patch.dict(
-        "sys.modules", {"celery": type("MockCelery", (), {"current_task": mock_task})}
-    ):
-        assert _is_celery_worker() is True
+    monkeypatch.setitem(sys.modules, "celery", SimpleNamespace(current_task=mock_task))
+    assert _is_celery_worker() is True
 
 
-def test_is_celery_worker_no_celery() -> None:
+def test_is_celery_worker_no_celery(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test Celery detection when not in Celery environment."""
-    import sys
-
-    # Clear environment and argv to simulate non-Celery environment
-    with (
-        patch.dict("os.environ", {}, clear=True),
-        patch.object(sys, "argv", ["python", "script.py"]),
-    ):
-        # Since we can't easily mock all the detection paths without affecting imports,
-        # we'll test that the function doesn't crash and returns a boolean
-        result = _is_celery_worker()
-        assert isinstance(result, bool)
-
-
-def test_constant_represents_computed_value() -> None:
-    """Test that the constant represents a pre-computed value."""
-    # The constant should be a boolean value computed at import time
-    assert isinstance(IS_CELERY_WORKER, bool)
-
-    # We can't easily test the exact value without affecting global state,
-    # but we can verify it's consistent
-    assert IS_CELERY_WORKER in [True, False]
+    # Remove the Celery variables and argv to simulate non-Celery environment
+    for env_var in CELERY_ENV_VARS:
+        monkeypatch.delenv(env_var, raising=False)
+    monkeypatch.setattr(sys, "argv", ["python", "script.py"])
+    # A None entry makes "from celery import current_task" raise ImportError
+    monkeypatch.setitem(sys.modules, "celery", None)
+
+    assert _is_celery_worker() is False
+
+
+def test_is_celery_worker_is_detected_once() -> None:
+    """Test that detection runs on first use and is then cached."""
+    is_celery_worker.cache_clear()
+    try:
+        with patch("apns2.helpers._is_celery_worker", return_value=True) as detect:
+            assert is_celery_worker() is True
+            assert apns2.helpers.IS_CELERY_WORKER is True
+        detect.assert_called_once()
+    finally:
+        is_celery_worker.cache_clear()
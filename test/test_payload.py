@@ -1,11 +1,43 @@
-import json
+from typing import Any
 
+import orjson
 import pytest
 
 from apns2.payload import MAX_PAYLOAD_SIZE, Payload, PayloadAlert
 
-
-@pytest.fixture
+# Expected dicts for the fully configured alert and payload, shared and never
+# modified by the tests
+_FULL_ALERT_DICT: dict[str, Any] = {
+    "title": "title",
+    "title-loc-key": "title_loc_k",
+    "title-loc-args": ["title_loc_a"],
+    "subtitle": "subtitle",
+    "subtitle-loc-key": "subtitle_loc_k",
+    "subtitle-loc-args": ["subtitle_loc_a"],
+    "body": "body",
+    "loc-key": "body_loc_k",
+    "loc-args": ["body_loc_a"],
+    "action-loc-key": "ac_loc_k",
+    "action": "send",
+    "launch-image": "img",
+}
+_FULL_PAYLOAD_DICT: dict[str, Any] = {
+    "aps": {
+        "alert": "my_alert",
+        "badge": 2,
+        "sound": "chime",
+        "content-available": 1,
+        "mutable-content": 1,
+        "category": "my_category",
+        "url-args": "args",
+        "thread-id": "42",
+    },
+    "extra": "something",
+}
+
+
+# Read-only in every test that uses it, so one instance serves the module
+@pytest.fixture(scope="module")
 def payload_alert() -> PayloadAlert:
     return PayloadAlert(
         title="title",
@@ -23,61 +55,9 @@ def payload_alert() -> PayloadAlert:
     )
 
 
-def test_payload_alert_full_configuration(payload_alert: PayloadAlert) -> None:
-    """Test PayloadAlert with all possible fields."""
-    assert payload_alert.dict() == {
-        "title": "title",
-        "title-loc-key": "title_loc_k",
-        "title-loc-args": ["title_loc_a"],
-        "subtitle": "subtitle",
-        "subtitle-loc-key": "subtitle_loc_k",
-        "subtitle-loc-args": ["subtitle_loc_a"],
-        "body": "body",
-        "loc-key": "body_loc_k",
-        "loc-args": ["body_loc_a"],
-        "action-loc-key": "ac_loc_k",
-        "action": "send",
-        "launch-image": "img",
-    }
-
-
-def test_payload_alert_minimal() -> None:
-    """Test PayloadAlert with minimal configuration."""
-    alert = PayloadAlert(body="Simple message")
-    assert alert.dict() == {"body": "Simple message"}
-
-
-def test_payload_alert_empty() -> None:
-    """Test PayloadAlert with no fields set."""
-    alert = PayloadAlert()
-    assert alert.dict() == {}
-
-
-def test_payload_alert_only_title() -> None:
-    """Test PayloadAlert with only title."""
-    alert = PayloadAlert(title="Just a title")
-    assert alert.dict() == {"title": "Just a title"}
-
-
-def test_payload_alert_localized_only() -> None:
-    """Test PayloadAlert with only localized content."""
-    alert = PayloadAlert(
-        title_localized_key="TITLE_KEY",
-        title_localized_args=["arg1", "arg2"],
-        body_localized_key="BODY_KEY",
-        body_localized_args=["body_arg"],
-    )
-    assert alert.dict() == {
-        "title-loc-key": "TITLE_KEY",
-        "title-loc-args": ["arg1", "arg2"],
-        "loc-key": "BODY_KEY",
-        "loc-args": ["body_arg"],
-    }
-
-
-def test_payload_full_configuration() -> None:
-    """Test Payload with all possible fields."""
-    payload = Payload(
+@pytest.fixture(scope="module")
+def full_payload_dict() -> dict[str, Any]:
+    return Payload(
         alert="my_alert",
         badge=2,
         sound="chime",
@@ -87,20 +67,49 @@ def test_payload_full_configuration() -> None:
         url_args="args",
         custom={"extra": "something"},
         thread_id="42",
-    )
-    assert payload.dict() == {
-        "aps": {
-            "alert": "my_alert",
-            "badge": 2,
-            "sound": "chime",
-            "content-available": 1,
-            "mutable-content": 1,
-            "category": "my_category",
-            "url-args": "args",
-            "thread-id": "42",
-        },
-        "extra": "something",
-    }
+    ).dict()
+
+
+def test_payload_alert_full_configuration(payload_alert: PayloadAlert) -> None:
+    """Test PayloadAlert with all possible fields."""
+    assert payload_alert.dict() == _FULL_ALERT_DICT
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        pytest.param({}, {}, id="empty"),
+        pytest.param(
+            {"body": "Simple message"}, {"body": "Simple message"}, id="body-only"
+        ),
+        pytest.param(
+            {"title": "Just a title"}, {"title": "Just a title"}, id="title-only"
+        ),
+        pytest.param(
+            {
+                "title_localized_key": "TITLE_KEY",
+                "title_localized_args": ["arg1", "arg2"],
+                "body_localized_key": "BODY_KEY",
+                "body_localized_args": ["body_arg"],
+            },
+            {
+                "title-loc-key": "TITLE_KEY",
+                "title-loc-args": ["arg1", "arg2"],
+                "loc-key": "BODY_KEY",
+                "loc-args": ["body_arg"],
+            },
+            id="localized-only",
+        ),
+    ],
+)
+def test_payload_alert_dict(kwargs: dict[str, Any], expected: dict[str, Any]) -> None:
+    """Test that partially configured PayloadAlerts only include the set fields."""
+    assert PayloadAlert(**kwargs).dict() == expected
+
+
+def test_payload_full_configuration(full_payload_dict: dict[str, Any]) -> None:
+    """Test Payload with all possible fields."""
+    assert full_payload_dict == _FULL_PAYLOAD_DICT
 
 
 def test_payload_minimal() -> None:
@@ -130,24 +139,7 @@ def test_payload_badge_zero() -> None:
 def test_payload_with_payload_alert(payload_alert: PayloadAlert) -> None:
     """Test Payload using PayloadAlert object."""
     payload = Payload(alert=payload_alert)
-    assert payload.dict() == {
-        "aps": {
-            "alert": {
-                "title": "title",
-                "title-loc-key": "title_loc_k",
-                "title-loc-args": ["title_loc_a"],
-                "subtitle": "subtitle",
-                "subtitle-loc-key": "subtitle_loc_k",
-                "subtitle-loc-args": ["subtitle_loc_a"],
-                "body": "body",
-                "loc-key": "body_loc_k",
-                "loc-args": ["body_loc_a"],
-                "action-loc-key": "ac_loc_k",
-                "action": "send",
-                "launch-image": "img",
-            }
-        }
-    }
+    assert payload.dict() == {"aps": {"alert": _FULL_ALERT_DICT}}
 
 
 def test_payload_complex_custom_data() -> None:
@@ -164,25 +156,27 @@ def test_payload_complex_custom_data() -> None:
     payload = Payload(alert="You have a new message", badge=1, custom=custom_data)
 
     result = payload.dict()
-    assert result["aps"]["alert"] == "You have a new message"
-    assert result["aps"]["badge"] == 1
-    assert result["user_info"] == custom_data["user_info"]
-    assert result["action_data"] == custom_data["action_data"]
-
-
-def test_payload_sound_variations() -> None:
+    assert (
+        result["aps"].items() >= {"alert": "You have a new message", "badge": 1}.items()
+    )
+    assert result.items() >= custom_data.items()
+
+
+@pytest.mark.parametrize(
+    "sound",
+    [
+        pytest.param("default", id="default"),
+        pytest.param("custom.caf", id="custom"),
+        pytest.param(None, id="no-sound"),
+    ],
+)
+def test_payload_sound_variations(sound: str | None) -> None:
     """Test different sound configurations."""
-    # Default sound
-    payload1 = Payload(alert="Test", sound="default")
-    assert payload1.dict()["aps"]["sound"] == "default"
-
-    # Custom sound
-    payload2 = Payload(alert="Test", sound="custom.caf")
-    assert payload2.dict()["aps"]["sound"] == "custom.caf"
-
-    # No sound
-    payload3 = Payload(alert="Test")
-    assert "sound" not in payload3.dict()["aps"]
+    aps = Payload(alert="Test", sound=sound).dict()["aps"]
+    if sound is None:
+        assert "sound" not in aps
+    else:
+        assert aps["sound"] == sound
 
 
 def test_payload_url_args_list() -> None:
@@ -191,17 +185,17 @@ def test_payload_url_args_list() -> None:
     assert payload.dict()["aps"]["url-args"] == ["arg1", "arg2", "arg3"]
 
 
-def test_payload_serialization_size() -> None:
+@pytest.mark.parametrize("alert_size", [1000, 2000, 3000])
+def test_payload_serialization_size(alert_size: int) -> None:
     """Test that payload serialization respects size limits."""
-    # Create a payload that's close to the limit
-    large_text = "x" * 3000
-    payload = Payload(alert=large_text, custom={"data": "small"})
+    # Create payloads up to close to the limit
+    payload = Payload(alert="x" * alert_size, custom={"data": "small"})
 
-    # Serialize to JSON to check size
-    json_str = json.dumps(payload.dict(), separators=(",", ":"))
+    # Serialize with orjson, as the client does by default
+    raw = orjson.dumps(payload.dict())
 
     # Should be under the limit
-    assert len(json_str.encode("utf-8")) < MAX_PAYLOAD_SIZE
+    assert len(raw) < MAX_PAYLOAD_SIZE
 
 
 def test_payload_empty() -> None:
@@ -210,36 +204,25 @@ def test_payload_empty() -> None:
     assert payload.dict() == {"aps": {}}
 
 
-def test_payload_thread_id_variations() -> None:
+# A conversation style ID and a numeric one passed as a string
+@pytest.mark.parametrize("thread_id", ["conversation-123", "456"])
+def test_payload_thread_id_variations(thread_id: str) -> None:
     """Test different thread_id configurations."""
-    # String thread ID
-    payload1 = Payload(alert="Test", thread_id="conversation-123")
-    assert payload1.dict()["aps"]["thread-id"] == "conversation-123"
+    payload = Payload(alert="Test", thread_id=thread_id)
+    assert payload.dict()["aps"]["thread-id"] == thread_id
 
-    # Numeric thread ID (as string)
-    payload2 = Payload(alert="Test", thread_id="456")
-    assert payload2.dict()["aps"]["thread-id"] == "456"
 
-
-def test_payload_boolean_flags() -> None:
+@pytest.mark.parametrize("content_available", [True, False])
+@pytest.mark.parametrize("mutable_content", [True, False])
+def test_payload_boolean_flags(content_available: bool, mutable_content: bool) -> None:
     """Test boolean flag handling."""
-    # Both flags true
-    payload1 = Payload(content_available=True, mutable_content=True)
-    result1 = payload1.dict()["aps"]
-    assert result1["content-available"] == 1
-    assert result1["mutable-content"] == 1
-
-    # Both flags false (should not appear in dict)
-    payload2 = Payload(content_available=False, mutable_content=False)
-    result2 = payload2.dict()["aps"]
-    assert "content-available" not in result2
-    assert "mutable-content" not in result2
+    aps = Payload(
+        content_available=content_available, mutable_content=mutable_content
+    ).dict()["aps"]
 
-    # Mixed flags
-    payload3 = Payload(content_available=True, mutable_content=False)
-    result3 = payload3.dict()["aps"]
-    assert result3["content-available"] == 1
-    assert "mutable-content" not in result3
+    # Set flags are sent as 1, unset flags are left out
+    assert aps.get("content-available") == (1 if content_available else None)
+    assert aps.get("mutable-content") == (1 if mutable_content else None)
 
 
 def test_payload_with_none_values() -> None:
@@ -256,3 +239,9 @@ def test_payload_with_none_values() -> None:
     assert "sound" not in result["aps"]
     assert "category" not in result["aps"]
     assert "thread-id" not in result["aps"]
+
+
+def test_payload_classes_use_slots() -> None:
+    """Test that payload objects don't carry a per-instance __dict__."""
+    assert not hasattr(Payload(alert="Test"), "__dict__")
+    assert not hasattr(PayloadAlert(title="Test"), "__dict__")